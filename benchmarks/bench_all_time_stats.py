@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Cold-cache latency of the All Time Stats highlights: the original twelve
+sequential queries over player_stats/daily_summary vs the one-row
+all_time_stats snapshot that update_database.py writes at ingest.
+
+The shipped database is replicated with shifted battle dates to reach 10x
+and 100x its size. "Cold" means a fresh connection per call, i.e. an empty
+SQLite page cache, which is what a Streamlit cache miss pays.
+
+Usage: python benchmarks/bench_all_time_stats.py [SCALE ...]  (default 1 10 100)
+"""
+
+import math
+import os
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import update_database as udb
+
+SOURCE_DB = os.path.join(REPO_DIR, "data", "daily_stats.db")
+RUNS = 5
+
+
+def legacy_all_time_stats(conn):
+    """The original get_all_time_stats() body, one scan per highlight
+    (on player ids, as player_stats is now keyed)."""
+    cursor = conn.cursor()
+    cursor.execute("SELECT COUNT(*) FROM daily_summary")
+    total_battles = cursor.fetchone()[0]
+    cursor.execute("SELECT COUNT(DISTINCT player_id) FROM player_stats")
+    total_players = cursor.fetchone()[0]
+    cursor.execute("SELECT MIN(date), MAX(date) FROM daily_summary")
+    first_battle, last_battle = cursor.fetchone()
+    cursor.execute("SELECT winner, COUNT(*) as wins FROM daily_summary GROUP BY winner ORDER BY wins DESC LIMIT 1")
+    top_winner = cursor.fetchone()
+    cursor.execute("SELECT SUM(kills) FROM player_stats")
+    total_kills = cursor.fetchone()[0] or 0
+    cursor.execute("SELECT SUM(damage_dealt) FROM player_stats")
+    total_damage = cursor.fetchone()[0] or 0
+    cursor.execute("SELECT player_id, SUM(kills) as t FROM player_stats GROUP BY player_id ORDER BY t DESC LIMIT 1")
+    top_killer = cursor.fetchone()
+    cursor.execute("SELECT player_id, SUM(damage_dealt) as t FROM player_stats GROUP BY player_id ORDER BY t DESC LIMIT 1")
+    top_damage_dealer = cursor.fetchone()
+    cursor.execute("""
+        SELECT player_id, SUM(kills), SUM(deaths),
+               CASE WHEN SUM(deaths) > 0 THEN CAST(SUM(kills) AS FLOAT) / SUM(deaths) ELSE SUM(kills) END as kdr
+        FROM player_stats GROUP BY player_id HAVING SUM(kills) > 0 ORDER BY kdr DESC LIMIT 1
+    """)
+    top_kdr = cursor.fetchone()
+    cursor.execute("SELECT player_id, COUNT(*) as n FROM player_stats GROUP BY player_id ORDER BY n DESC LIMIT 1")
+    most_active = cursor.fetchone()
+    cursor.execute("SELECT player_id, kills, battle_id FROM player_stats ORDER BY kills DESC LIMIT 1")
+    highest_kills = cursor.fetchone()
+    cursor.execute("SELECT player_id, damage_dealt, battle_id FROM player_stats ORDER BY damage_dealt DESC LIMIT 1")
+    highest_damage = cursor.fetchone()
+    cursor.execute("SELECT date, COUNT(*) as n FROM daily_summary GROUP BY date ORDER BY n DESC LIMIT 1")
+    most_active_day = cursor.fetchone()
+    return {
+        "total_battles": total_battles, "total_players": total_players,
+        "first_battle": first_battle, "last_battle": last_battle,
+        "top_wins": top_winner[1], "total_kills": total_kills, "total_damage": total_damage,
+        "top_killer_kills": top_killer[1], "top_damage_dealt": top_damage_dealer[1],
+        "top_kdr_ratio": round(top_kdr[3], 2), "most_active_battles": most_active[1],
+        "highest_kills_count": highest_kills[1], "highest_damage_amount": highest_damage[1],
+        "most_active_day_battles": most_active_day[1],
+    }
+
+
+def snapshot_all_time_stats(conn):
+    """What the dashboard's get_all_time_stats() now does."""
+    cursor = conn.execute("SELECT * FROM all_time_stats WHERE id = 1")
+    return dict(zip([col[0] for col in cursor.description], cursor.fetchone()))
+
+
+def build_scaled_db(path, scale):
+    """Copy the shipped database and replicate its battles ``scale`` times."""
+    shutil.copyfile(SOURCE_DB, path)
+    conn = sqlite3.connect(path)
+    udb.ensure_schema(conn)
+    first, last, span = conn.execute(
+        "SELECT MIN(date), MAX(date), julianday(MAX(date)) - julianday(MIN(date)) + 1 FROM daily_summary"
+    ).fetchone()
+    with conn:
+        for copy in range(1, scale):
+            shift = f"+{int(copy * span)} days"
+            conn.execute("""
+                INSERT INTO daily_summary (date, num_players, winner)
+                SELECT date(date, ?), num_players, winner FROM daily_summary WHERE date BETWEEN ? AND ?
+            """, (shift, first, last))
+            conn.execute("""
+                INSERT INTO battles (date)
+                SELECT date(date, ?) FROM battles WHERE date BETWEEN ? AND ?
+            """, (shift, first, last))
+            for table, columns in (
+                ("player_stats", "player_id, kills, deaths, damage_dealt, damage_received, nemesis_id, victim_id"),
+                ("ranking", "player_id, rank"),
+            ):
+                conn.execute(f"""
+                    INSERT INTO {table} (battle_id, {columns})
+                    SELECT shifted.battle_id, {columns}
+                    FROM {table}
+                    JOIN battles b USING (battle_id)
+                    JOIN battles shifted ON shifted.date = date(b.date, ?)
+                    WHERE b.date BETWEEN ? AND ?
+                """, (shift, first, last))
+        udb.refresh_player_totals(conn)
+        udb.refresh_all_time_stats(conn)
+    rows = conn.execute("SELECT COUNT(*) FROM player_stats").fetchone()[0]
+    conn.execute("PRAGMA optimize")
+    conn.close()
+    return rows
+
+
+def cold_ms(db_path, reader):
+    """Median wall time of ``reader`` on a fresh connection, in ms."""
+    samples = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        conn = sqlite3.connect(db_path)
+        result = reader(conn)
+        conn.close()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def main(scales):
+    print(f"{'scale':>5} {'rows':>10} {'12 queries ms':>14} {'snapshot ms':>12} {'refresh at ingest ms':>21}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for scale in scales:
+            db_path = os.path.join(tmp_dir, f"x{scale}.db")
+            rows = build_scaled_db(db_path, scale)
+            legacy_ms, legacy = cold_ms(db_path, legacy_all_time_stats)
+            snapshot_ms, snapshot = cold_ms(db_path, snapshot_all_time_stats)
+            for key, value in legacy.items():
+                assert snapshot[key] == value or math.isclose(snapshot[key], value, rel_tol=1e-9), (key, snapshot[key], value)
+
+            conn = sqlite3.connect(db_path)
+            start = time.perf_counter()
+            with conn:
+                udb.refresh_all_time_stats(conn)
+            refresh_ms = (time.perf_counter() - start) * 1000
+            conn.close()
+            print(f"{scale:>4}x {rows:>10,} {legacy_ms:>14.1f} {snapshot_ms:>12.2f} {refresh_ms:>21.1f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1, 10, 100])
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Timing comparison: a per-row iterrows INSERT loop, like the original
+process_simulation_logs(), vs the bulk executemany writer used by
+update_database.py.
+
+Both sides write the same thing: the battle's interned player ids
+(including nemeses and victims) and its player_stats and ranking rows,
+all eight columns. The only differences measured are one execute per row
+against one executemany per table, and the connection settings. The loop
+runs on a default connection (as the original did) and on
+connect_for_load's, so the last two columns separate the effect of
+batching from that of the load pragmas.
+
+Usage: python benchmarks/bench_bulk_write.py [NUM_PARTICLES ...]
+(defaults to 10,000 and 100,000 particles)
+"""
+
+import os
+import sys
+import sqlite3
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+import update_database as udb
+from synthetic_log import make_collision_log
+
+DATE = "2099-01-01"
+
+
+def per_row_id(conn, name):
+    """One fighter's player_id, added on first use, one statement at a time."""
+    if pd.isna(name):
+        return None
+    conn.execute("INSERT OR IGNORE INTO players (player) VALUES (?)", (name,))
+    return conn.execute("SELECT player_id FROM players WHERE player = ?", (name,)).fetchone()[0]
+
+
+def per_row_write(conn, date_str, final_stats):
+    """write_player_stats' rows, written the original way: one execute per
+    statement per DataFrame row."""
+    battle = udb.battle_id(conn, date_str)
+    for _, row in final_stats.iterrows():
+        player = per_row_id(conn, row['player'])
+        conn.execute("""
+            INSERT OR REPLACE INTO player_stats
+            (battle_id, player_id, kills, deaths, damage_dealt, damage_received, nemesis_id, victim_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (battle, player, int(row['kills']), int(row['deaths']), float(row['damage_dealt']),
+              float(row['damage_received']), per_row_id(conn, row['nemesis']), per_row_id(conn, row['victim'])))
+        conn.execute("INSERT OR REPLACE INTO ranking (battle_id, player_id, rank) VALUES (?, ?, ?)",
+                     (battle, player, int(row['rank'])))
+
+
+def time_writer(name, writer, final_stats, tmp_dir, connect):
+    """Write ``final_stats`` into a fresh database and return elapsed
+    seconds and the rows written."""
+    db_path = os.path.join(tmp_dir, f"{name}.db")
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    conn = connect(db_path)
+    udb.ensure_schema(conn)
+    try:
+        start = time.perf_counter()
+        with conn:
+            writer(conn, DATE, final_stats)
+        elapsed = time.perf_counter() - start
+        # By name: the two writers hand out player_ids in different orders
+        rows = conn.execute("""
+            SELECT p.player, ps.kills, ps.deaths, ps.damage_dealt, ps.damage_received, n.player, v.player, r.rank
+            FROM player_stats ps
+            JOIN players p ON p.player_id = ps.player_id
+            LEFT JOIN players n ON n.player_id = ps.nemesis_id
+            LEFT JOIN players v ON v.player_id = ps.victim_id
+            JOIN ranking r ON r.battle_id = ps.battle_id AND r.player_id = ps.player_id
+            ORDER BY p.player
+        """).fetchall()
+        return elapsed, rows
+    finally:
+        conn.close()
+
+
+def main(sizes):
+    print(f"{'particles':>10} {'per-row (s)':>12} {'+ pragmas (s)':>14} {'bulk (s)':>9} "
+          f"{'speedup':>8} {'of which batching':>18}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in sizes:
+            final_stats, _ = udb.aggregate_log(make_collision_log(size, seed=size))
+            per_row, expected = time_writer("per_row", per_row_write, final_stats, tmp_dir, sqlite3.connect)
+            tuned, _ = time_writer("per_row_tuned", per_row_write, final_stats, tmp_dir, udb.connect_for_load)
+            bulk, rows = time_writer("bulk", udb.write_player_stats, final_stats, tmp_dir, udb.connect_for_load)
+            if rows != expected:
+                sys.exit("bulk writer stored different rows than the per-row loop")
+            print(f"{size:>10,} {per_row:>12.3f} {tuned:>14.3f} {bulk:>9.3f} "
+                  f"{per_row / bulk:>7.1f}x {tuned / bulk:>17.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000])
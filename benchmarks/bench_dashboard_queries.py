@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Latency of every dashboard query helper, cold and warm, on databases of
+growing size, with a JSON report to diff between versions.
+
+The helpers are the dashboard's own, imported from dashboard_data and
+pointed at each database. "Cold" clears Streamlit's caches and connection pool
+before every call, i.e. what the first visitor after a new battle pays (the
+OS page cache stays warm); "warm" repeats the call once it is cached. The
+battle is the newest one and the fighter the one with the most battles,
+the largest Fighter Analysis history.
+
+Databases are the shipped one plus synthetic ones from synthetic_db.py
+(generated into a temp dir, or pass --db for one made beforehand, since
+1,000 x 1,000 takes a few minutes to build).
+
+Usage: python benchmarks/bench_dashboard_queries.py [--db PATH ...]
+       [--scale BATTLESxFIGHTERS ...] [--runs N] [--out REPORT.json]
+       [--baseline OLD_REPORT.json]
+(defaults to the shipped database and 200 x 1,000, 5 cold and 50 warm runs)
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import streamlit as st
+from streamlit import logger as st_logger
+
+import dashboard_data as app
+import update_database as udb
+from synthetic_db import make_database
+
+WARM_RUNS = 50
+
+
+def helper_calls(date_str, player):
+    """(section, helper, call) for every query helper the dashboard uses."""
+    version = app.get_data_version()
+    search = player[:len(player) // 2]
+    return [
+        ("Daily Battles", "get_data_version", lambda: app.get_data_version()),
+        ("Daily Battles", "get_available_dates", lambda: app.get_available_dates(version)),
+        ("Daily Battles", "load_battle", lambda: app.load_battle(date_str, version)),
+        ("Daily Battles", "get_daily_summary",
+         lambda: app.get_daily_summary(app.load_battle(date_str, version))),
+        ("Daily Battles", "get_top_players[kills]",
+         lambda: app.get_top_players(app.load_battle(date_str, version), "kills")),
+        ("Daily Battles", "get_top_players[damage_dealt]",
+         lambda: app.get_top_players(app.load_battle(date_str, version), "damage_dealt")),
+        ("Daily Battles", "get_top_players[rank]",
+         lambda: app.get_top_players(app.load_battle(date_str, version), "rank")),
+        ("Daily Battles", "get_battle_player_index.search",
+         lambda: app.get_battle_player_index(date_str, version).search(search)),
+        ("Daily Battles", "get_player_stats",
+         lambda: app.get_player_stats(app.load_battle(date_str, version), player)),
+        ("Daily Battles", "get_player_percentiles",
+         lambda: app.get_player_percentiles(app.load_battle(date_str, version), player)),
+        ("Daily Battles", "get_normalized_rank",
+         lambda: app.get_normalized_rank(app.load_battle(date_str, version), player)),
+        ("All Time Stats", "get_all_time_stats", lambda: app.get_all_time_stats(version)),
+        ("All Time Stats", "get_all_time_leaderboard[kills]",
+         lambda: app.get_all_time_leaderboard("kills", version)),
+        ("All Time Stats", "get_all_time_leaderboard[damage_dealt]",
+         lambda: app.get_all_time_leaderboard("damage_dealt", version)),
+        ("All Time Stats", "get_all_daily_winners", lambda: app.get_all_daily_winners(version)),
+        ("Fighter Analysis", "get_all_players", lambda: app.get_all_players(version)),
+        ("Fighter Analysis", "get_all_player_index.search",
+         lambda: app.get_all_player_index(version).search(search)),
+        ("Fighter Analysis", "get_fighter_totals", lambda: app.get_fighter_totals(player, version)),
+        ("Fighter Analysis", "get_fighter_history", lambda: app.get_fighter_history(player, version)),
+        ("Fighter Analysis", "get_rivalries", lambda: app.get_rivalries(player, version)),
+        ("Live", "load_live_battle", lambda: app.load_live_battle(app.get_live_version())),
+    ]
+
+
+def clear_caches():
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+
+def time_ms(call):
+    start = time.perf_counter()
+    call()
+    return (time.perf_counter() - start) * 1000
+
+
+def describe(db_path):
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        (battles,) = conn.execute("SELECT COUNT(*) FROM daily_summary").fetchone()
+        (rows,) = conn.execute("SELECT COUNT(*) FROM player_stats").fetchone()
+        (players,) = conn.execute("SELECT COUNT(*) FROM player_totals").fetchone()
+        (date_str,) = conn.execute("SELECT MAX(date) FROM daily_summary").fetchone()
+        (player,) = conn.execute("""
+            SELECT p.player FROM player_totals t JOIN players p ON p.player_id = t.player_id
+            ORDER BY t.battles DESC, p.player LIMIT 1
+        """).fetchone()
+    finally:
+        conn.close()
+    return {"battles": battles, "player_stats_rows": rows, "players": players,
+            "size_bytes": os.path.getsize(db_path), "date": date_str, "player": player}
+
+
+def bench_database(name, db_path, runs):
+    info = describe(db_path)
+    app.DB_PATH = db_path
+    clear_caches()
+    helpers = {}
+    for section, helper, call in helper_calls(info["date"], info["player"]):
+        cold = []
+        for _ in range(runs):
+            clear_caches()
+            cold.append(time_ms(call))
+        call()
+        warm = [time_ms(call) for _ in range(WARM_RUNS)]
+        helpers[helper] = {
+            "section": section,
+            "cold_ms": {"median": statistics.median(cold), "max": max(cold)},
+            "warm_ms": {"median": statistics.median(warm), "max": max(warm)},
+        }
+    clear_caches()
+    return {"name": name, **info, "helpers": helpers}
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_database(result, baseline=None):
+    print(f"\n{result['name']}: {result['battles']:,} battles, {result['player_stats_rows']:,} player_stats rows, "
+          f"{result['players']:,} fighters, {result['size_bytes'] / 2**20:,.1f} MiB")
+    header = f"{'helper':<40} {'cold (ms)':>10} {'warm (ms)':>10}"
+    if baseline:
+        header += f" {'cold vs base':>13}"
+    print(header)
+    for helper, timings in result["helpers"].items():
+        line = f"{helper:<40} {timings['cold_ms']['median']:>10.2f} {timings['warm_ms']['median']:>10.3f}"
+        base = (baseline or {}).get("helpers", {}).get(helper)
+        if base:
+            line += f" {timings['cold_ms']['median'] / base['cold_ms']['median']:>12.2f}x"
+        print(line)
+
+
+def parse_scale(text):
+    battles, fighters = text.lower().split("x")
+    return int(battles), int(fighters)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time every dashboard query helper, cold and warm.")
+    parser.add_argument("--db", action="append", default=[],
+                        help="database to benchmark (repeatable; default: the shipped one)")
+    parser.add_argument("--scale", action="append", type=parse_scale, default=[],
+                        help="also generate and benchmark BATTLESxFIGHTERS (repeatable; default: 200x1000)")
+    parser.add_argument("--runs", type=int, default=5, help="cold runs per helper")
+    parser.add_argument("--out", help="write the JSON report here")
+    parser.add_argument("--baseline", help="earlier JSON report to compare cold timings against")
+    args = parser.parse_args(argv)
+    if not args.db and not args.scale:
+        args.db = [os.path.join(REPO_DIR, udb.DB_PATH)]
+        args.scale = [(200, 1_000)]
+
+    st_logger.set_log_level("error")  # no bare-mode warnings per cached call
+    app.USE_SNAPSHOTS = False
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = {result["name"]: result for result in json.load(f)["databases"]}
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for db_path in args.db:
+            results.append(bench_database(os.path.basename(db_path), db_path, args.runs))
+            print_database(results[-1], baseline.get(results[-1]["name"]))
+        for battles, fighters in args.scale:
+            name = f"synthetic_{battles}x{fighters}"
+            db_path = os.path.join(tmp_dir, f"{name}.db")
+            start = time.perf_counter()
+            make_database(db_path, battles, fighters)
+            print(f"\nGenerated {name} in {time.perf_counter() - start:.0f}s")
+            results.append(bench_database(name, db_path, args.runs))
+            print_database(results[-1], baseline.get(name))
+
+    report = {
+        "generated": datetime.datetime.now().isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "streamlit": st.__version__,
+        "cold_runs": args.runs,
+        "warm_runs": WARM_RUNS,
+        "databases": results,
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Wall-clock scaling of update_database.py --rebuild with the number of
+worker processes. Each run rebuilds the same synthetic logs (CSV only, no
+archives) into a fresh database; the resulting player_stats must match the
+single-process run exactly.
+
+Usage: python benchmarks/bench_rebuild.py [NUM_LOGS [FIGHTERS [HITS_PER_FIGHTER]]]
+(defaults to 8 logs of 2,000 fighters with 100 hits each; worker counts
+1, 2, 4, ... up to the machine's cores)
+"""
+
+import contextlib
+import io
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import update_database as udb
+from synthetic_log import write_collision_log
+
+
+def rebuild(tmp_dir, workers):
+    """Rebuild the logs in tmp_dir into a new database; return (seconds, rows)."""
+    db_path = os.path.join(tmp_dir, f"rebuild_{workers}.db")
+    sources = udb.rebuild_sources(tmp_dir, archive_dir=None)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        udb.rebuild_database(sources, db_path, workers, archive_dir=None,
+                             snapshot_dir=os.path.join(tmp_dir, "no_snapshots"),
+                             manifest_path=os.path.join(tmp_dir, f"manifest_{workers}.json"))
+    elapsed = time.perf_counter() - start
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute("""
+            SELECT b.date, p.player, ps.kills, ps.deaths, ps.damage_dealt, ps.damage_received,
+                   n.player, v.player
+            FROM player_stats ps
+            JOIN battles b ON b.battle_id = ps.battle_id
+            JOIN players p ON p.player_id = ps.player_id
+            LEFT JOIN players n ON n.player_id = ps.nemesis_id
+            LEFT JOIN players v ON v.player_id = ps.victim_id
+            ORDER BY b.date, p.player
+        """).fetchall()
+    finally:
+        conn.close()
+    return elapsed, rows
+
+
+def main(num_logs=8, fighters=2_000, hits=100):
+    cores = os.cpu_count() or 1
+    worker_counts = [1]
+    while worker_counts[-1] * 2 <= min(cores, num_logs):
+        worker_counts.append(worker_counts[-1] * 2)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for i in range(num_logs):
+            log_path = os.path.join(tmp_dir, f"209901{i + 1:02d}_000000{udb.LOG_SUFFIX}")
+            write_collision_log(log_path, fighters, seed=i, hits_per_player=(hits, hits))
+
+        print(f"{num_logs} logs of {fighters:,} fighters x {hits} hits, {cores} cores")
+        print(f"{'workers':>8} {'seconds':>8} {'speedup':>8}")
+        baseline = expected = None
+        for workers in worker_counts:
+            elapsed, rows = rebuild(tmp_dir, workers)
+            if expected is None:
+                baseline, expected = elapsed, rows
+            elif rows != expected:
+                sys.exit(f"rebuild with {workers} workers wrote different player_stats")
+            print(f"{workers:>8} {elapsed:>8.2f} {baseline / elapsed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
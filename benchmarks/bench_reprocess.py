@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Timing comparison for recomputing history: re-parsing each collision log
+CSV vs replaying its memory-mapped archive (update_database.py --reprocess).
+Also checks both paths give identical player stats and edges, and reports
+the archive's size against the CSV's.
+
+Usage: python benchmarks/bench_reprocess.py [NUM_LOGS [FIGHTERS [HITS_PER_FIGHTER]]]
+(defaults to 5 logs of 5,000 fighters with 200 hits each, ~1M rows a log)
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import pandas as pd
+
+import update_database as udb
+from synthetic_log import write_collision_log
+
+
+def main(num_logs=5, fighters=5_000, hits=200):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        archive_dir = os.path.join(tmp_dir, "archive")
+        log_paths = []
+        for i in range(num_logs):
+            log_path = os.path.join(tmp_dir, f"2099010{i + 1}_000000{udb.LOG_SUFFIX}")
+            write_collision_log(log_path, fighters, seed=i, hits_per_player=(hits, hits))
+            udb.archive_log(log_path, archive_dir)
+            log_paths.append(log_path)
+
+        csv_bytes = sum(os.path.getsize(path) for path in log_paths)
+        archive_bytes = sum(os.path.getsize(udb.archive_paths(path, archive_dir)[0]) for path in log_paths)
+        print(f"{num_logs} logs, {fighters:,} fighters x {hits} hits: "
+              f"CSV {csv_bytes / 2**20:,.0f} MiB, archive {archive_bytes / 2**20:,.0f} MiB")
+
+        start = time.perf_counter()
+        from_csv = [udb.read_log_file(path) for path in log_paths]
+        csv_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        from_archive = [udb.read_log_archive(udb.archive_paths(path, archive_dir)[1])[1] for path in log_paths]
+        archive_seconds = time.perf_counter() - start
+
+        for csv_agg, archive_agg in zip(from_csv, from_archive):
+            csv_stats, csv_winner = csv_agg.result()
+            archive_stats, archive_winner = archive_agg.result()
+            if csv_winner != archive_winner:
+                sys.exit("archive replay picked a different winner")
+            pd.testing.assert_frame_equal(csv_stats, archive_stats)
+            pd.testing.assert_frame_equal(csv_agg.edges(), archive_agg.edges())
+
+        print(f"{'CSV (s)':>9} {'archive (s)':>12} {'speedup':>8}")
+        print(f"{csv_seconds:>9.2f} {archive_seconds:>12.2f} {csv_seconds / archive_seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
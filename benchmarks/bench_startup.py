@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Cold-start cost of the dashboard: how long its imports take and how long
+the first render of each section takes in a fresh Python process, i.e.
+what the first visitor after a deploy or restart waits for.
+
+Every measurement runs in a new interpreter so nothing is already imported.
+"Imports" executes only the entry script's top-level import statements.
+"First render" runs the whole script once through Streamlit's AppTest with
+the section selected (including importing Streamlit itself), then "rerun"
+runs it again in the same process, as the next interaction would. Each
+row also says whether pandas and plotly.express ended up loaded.
+
+With --before REF the same is measured for the tree at git REF (extracted
+to a temp dir with its own copy of the database), to compare the layout
+before and after a change.
+
+Usage: python benchmarks/bench_startup.py [--runs N] [--before REF]
+(defaults to 5 runs per measurement, reporting the median)
+"""
+
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_FILE = "streamlit_app_Final.py"
+SECTIONS = ("Daily Battles", "All Time Stats", "Fighter Analysis", "Live")
+HEAVY_MODULES = ("pandas", "plotly.express")
+RENDER_TIMEOUT = 120
+
+
+def loaded_modules():
+    return {name: name in sys.modules for name in HEAVY_MODULES}
+
+
+def measure_imports(entry):
+    """Seconds to run ``entry``'s top-level imports in this process."""
+    with open(entry, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), entry)
+    tree.body = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    code = compile(tree, entry, "exec")
+    start = time.perf_counter()
+    exec(code, {"__file__": entry, "__name__": "dashboard"})
+    return {"imports_ms": (time.perf_counter() - start) * 1000, "loaded": loaded_modules()}
+
+
+def measure_render(entry, section):
+    """Seconds to the first and second complete run of ``entry`` showing
+    ``section``, counted from before Streamlit is imported."""
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(entry, default_timeout=RENDER_TIMEOUT)
+    at.session_state.current_section = section
+    # The Live section would otherwise keep polling for new events
+    at.session_state.live_auto_refresh = False
+    at.run()
+    first_ms = (time.perf_counter() - start) * 1000
+    errors = [e.value for e in at.exception]
+    loaded = loaded_modules()
+    start = time.perf_counter()
+    at.run()
+    return {"first_render_ms": first_ms, "rerun_ms": (time.perf_counter() - start) * 1000,
+            "loaded": loaded, "errors": errors}
+
+
+def run_child(tree_dir, *args):
+    """Run one measurement of this script in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", tree_dir, *args],
+        cwd=tree_dir, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def bench_tree(tree_dir, runs):
+    """Median imports and per-section render timings for one tree."""
+    imports = [run_child(tree_dir, "imports") for _ in range(runs)]
+    result = {
+        "imports_ms": statistics.median(r["imports_ms"] for r in imports),
+        "imports_loaded": imports[-1]["loaded"],
+        "sections": {},
+    }
+    for section in SECTIONS:
+        renders = [run_child(tree_dir, "render", section) for _ in range(runs)]
+        result["sections"][section] = {
+            "first_render_ms": statistics.median(r["first_render_ms"] for r in renders),
+            "rerun_ms": statistics.median(r["rerun_ms"] for r in renders),
+            "loaded": renders[-1]["loaded"],
+            "errors": renders[-1]["errors"],
+        }
+    return result
+
+
+def export_tree(ref, out_dir):
+    """Extract the files of git ``ref`` into ``out_dir``."""
+    archive = os.path.join(out_dir, "tree.tar")
+    subprocess.run(["git", "archive", "--format=tar", "-o", archive, ref], cwd=REPO_DIR, check=True)
+    tree_dir = os.path.join(out_dir, "tree")
+    with tarfile.open(archive) as tar:
+        tar.extractall(tree_dir)
+    return tree_dir
+
+
+def loaded_label(loaded):
+    return ", ".join(name for name, is_loaded in loaded.items() if is_loaded) or "-"
+
+
+def print_result(name, result, baseline=None):
+    print(f"\n{name}: imports {result['imports_ms']:,.0f} ms (loads {loaded_label(result['imports_loaded'])})")
+    header = f"{'section':<18} {'first render (ms)':>18} {'rerun (ms)':>11} {'loaded':<24}"
+    if baseline:
+        header += f" {'first vs before':>16}"
+    print(header)
+    for section, timings in result["sections"].items():
+        line = (f"{section:<18} {timings['first_render_ms']:>18,.0f} {timings['rerun_ms']:>11,.0f} "
+                f"{loaded_label(timings['loaded']):<24}")
+        if baseline:
+            before = baseline["sections"][section]["first_render_ms"]
+            line += f" {timings['first_render_ms'] / before:>15.2f}x"
+        print(line)
+        for error in timings["errors"]:
+            print(f"  ERROR: {error}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the dashboard's imports and first render per section.")
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes per measurement")
+    parser.add_argument("--before", metavar="REF", help="also measure the tree at this git ref")
+    parser.add_argument("--out", help="write the JSON report here")
+    parser.add_argument("--child", nargs="+", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        tree_dir, mode, *rest = args.child
+        sys.path.insert(0, tree_dir)
+        entry = os.path.join(tree_dir, ENTRY_FILE)
+        result = measure_imports(entry) if mode == "imports" else measure_render(entry, rest[0])
+        print(json.dumps(result))
+        return
+
+    report = {"runs": args.runs, "python": sys.version.split()[0]}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.before:
+            report["before"] = {"ref": args.before, **bench_tree(export_tree(args.before, tmp_dir), args.runs)}
+            print_result(f"before ({args.before})", report["before"])
+        report["after"] = bench_tree(REPO_DIR, args.runs)
+        print_result("working tree", report["after"], report.get("before"))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Peak-RSS comparison: whole-file ``pd.read_csv`` aggregation vs the chunked
+streaming reader used by update_database.py, on synthetic logs of growing
+length. Like a long 60 fps battle, the fighter count stays fixed while the
+number of collisions per fighter grows. Each measurement runs in a fresh
+interpreter so peaks do not overlap.
+
+Usage: python benchmarks/bench_streaming_ingest.py [HITS_PER_FIGHTER ...]
+(defaults to 50, 200 and 800 hits for each of 5,000 fighters)
+"""
+
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+
+def measure(mode, log_path):
+    """Run one aggregation in this process and print seconds and peak RSS (MiB)."""
+    import pandas as pd
+    import update_database as udb
+
+    start = time.perf_counter()
+    if mode == "full":
+        udb.aggregate_log(pd.read_csv(log_path))
+    else:
+        udb.aggregate_log_file(log_path)
+    elapsed = time.perf_counter() - start
+    print(elapsed, peak_rss_mib())
+
+
+def peak_rss_mib():
+    """This process's high-water RSS. VmHWM, unlike ru_maxrss, is not
+    inherited from the parent across fork/exec."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # Non-Linux fallback (KiB on Linux, bytes on macOS)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(mode, log_path):
+    out = subprocess.run(
+        [sys.executable, __file__, "--measure", mode, log_path],
+        check=True, capture_output=True, text=True,
+    ).stdout.split()
+    return float(out[0]), float(out[1])
+
+
+def main(hit_counts, num_particles=5_000):
+    from synthetic_log import write_collision_log
+
+    print(f"{'rows':>11} {'log MiB':>8} {'full s':>7} {'full RSS':>9} {'chunked s':>10} {'chunked RSS':>12}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for hits in hit_counts:
+            log_path = os.path.join(tmp_dir, f"{hits}_collision_log.csv")
+            write_collision_log(log_path, num_particles, seed=hits, hits_per_player=(hits, hits))
+            rows = (num_particles - 1) * hits + hits
+            log_mib = os.path.getsize(log_path) / 2**20
+            full_s, full_rss = run("full", log_path)
+            chunk_s, chunk_rss = run("chunked", log_path)
+            print(f"{rows:>11,} {log_mib:>8.0f} {full_s:>7.2f} {full_rss:>8.0f}M {chunk_s:>10.2f} {chunk_rss:>11.0f}M")
+            os.remove(log_path)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--measure"]:
+        measure(sys.argv[2], sys.argv[3])
+    else:
+        main([int(arg) for arg in sys.argv[1:]] or [50, 200, 800])
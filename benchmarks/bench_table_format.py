@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Timing comparison for the Battle History table: the original per-cell
+.apply(lambda) string formatting vs table_format.battle_history_frame,
+which keeps numbers numeric and leaves formatting to column_config.
+
+Both are also timed through Streamlit's Arrow serialization, which every
+st.dataframe call pays for the whole frame.
+
+Usage: python benchmarks/bench_table_format.py [NUM_ROWS ...]
+(defaults to 1,000 and 100,000 rows)
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from streamlit.dataframe_util import convert_pandas_df_to_arrow_bytes
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from table_format import HISTORY_COLUMNS, battle_history_frame
+
+REPEATS = 5
+
+
+def make_history(num_rows, seed=0):
+    """``num_rows`` history rows shaped like get_fighter_history() results."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2000-01-01", periods=num_rows, freq="D").strftime("%Y-%m-%d")[::-1]
+    ranks = rng.integers(0, 1000, num_rows)
+    kills = rng.integers(0, 8, num_rows)
+    deaths = rng.integers(0, 2, num_rows)
+    dealt = rng.random(num_rows) * 150
+    received = np.where(deaths == 1, 100.0, rng.random(num_rows) * 100)
+    standing = rng.random(num_rows) * 100
+    return list(zip(dates, ranks.tolist(), kills.tolist(), deaths.tolist(),
+                    dealt.tolist(), received.tolist(), standing.tolist()))
+
+
+def legacy_history_frame(rows):
+    """The original Battle History formatting from streamlit_app_Final.py."""
+    history_df = pd.DataFrame(rows, columns=HISTORY_COLUMNS)
+    history_df['K/D'] = history_df['Kills'] / history_df['Deaths'].replace(0, 1)
+    history_df['Efficiency'] = history_df['Damage Dealt'] / history_df['Damage Received'].replace(0, 1)
+    history_df['Date'] = history_df['Date'].apply(lambda x: str(x))
+    history_df['Rank'] = history_df['Rank'].apply(lambda x: f"#{x + 1}" if x is not None and x == 0 else f"#{x + 1}" if x is not None else "N/A")
+    history_df['K/D'] = history_df['K/D'].apply(lambda x: f"{x:.2f}")
+    history_df['Efficiency'] = history_df['Efficiency'].apply(lambda x: f"{x:.2f}x")
+    return history_df
+
+
+def best_of(func, rows):
+    """Best wall time over REPEATS runs of func(rows), plus Arrow serialization."""
+    build = render = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        df = func(rows)
+        built = time.perf_counter()
+        convert_pandas_df_to_arrow_bytes(df)
+        done = time.perf_counter()
+        build = min(build, built - start)
+        render = min(render, done - start)
+    return build, render
+
+
+def main(sizes):
+    print(f"{'rows':>8} {'legacy (ms)':>12} {'vector (ms)':>12} {'speedup':>8}"
+          f" {'legacy+arrow':>13} {'vector+arrow':>13} {'speedup':>8}")
+    for size in sizes:
+        rows = make_history(size, seed=size)
+
+        legacy, vector = legacy_history_frame(rows), battle_history_frame(rows)
+        expected = legacy["Rank"].str[1:].astype("int64")
+        if not (vector["Rank"].astype("int64") == expected).all():
+            sys.exit("battle_history_frame ranks differ from the legacy formatting")
+        if not (vector["K/D"].map("{:.2f}".format) == legacy["K/D"]).all():
+            sys.exit("battle_history_frame K/D differs from the legacy formatting")
+
+        legacy_build, legacy_render = best_of(legacy_history_frame, rows)
+        vector_build, vector_render = best_of(battle_history_frame, rows)
+        print(f"{size:>8,} {legacy_build * 1e3:>12.1f} {vector_build * 1e3:>12.1f}"
+              f" {legacy_build / vector_build:>7.1f}x"
+              f" {legacy_render * 1e3:>13.1f} {vector_render * 1e3:>13.1f}"
+              f" {legacy_render / vector_render:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1_000, 100_000])
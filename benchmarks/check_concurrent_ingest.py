@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Concurrency check for the WAL-mode database: ingests a large synthetic log
+with update_database.py in a separate process, as the daily job does, while
+several threads keep loading dashboard pages against the same file through
+dashboard_data's own helpers, i.e. its ConnectionPool, read transactions and
+busy retries. Every call passes a fresh cache key, so none is served from
+Streamlit's cache.
+
+Exits non-zero if any read still fails after the dashboard's own retries
+(e.g. "database is locked"), if the slowest page load takes longer than
+--max-read-seconds, if the readers never
+see the new battle, or if the ingest leaves anything in the -wal file.
+
+Usage: python benchmarks/check_concurrent_ingest.py [--db PATH] [--fighters N]
+       [--hits N] [--readers N] [--max-read-seconds S]
+(defaults to a copy of data/daily_stats.db, a 20,000-fighter log with 100
+hits each (~2M rows), 4 reader threads and a 1 s bound)
+"""
+
+import argparse
+import itertools
+import os
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from streamlit import logger as st_logger
+
+# No bare-mode warnings from the dashboard's cached helpers
+st_logger.set_log_level("error")
+
+import dashboard_data as app
+import dashboard_queries
+import update_database as udb
+from synthetic_log import write_collision_log
+
+# Cache keys no two calls share, so every helper call reads the database
+cache_keys = itertools.count()
+
+
+def read_once(page, dates, players):
+    """The query helpers one dashboard page load calls: a battle, a
+    fighter or the All Time Stats view."""
+    if page == "battle":
+        app.load_battle(random.choice(dates), next(cache_keys))
+    elif page == "fighter":
+        player = random.choice(players)
+        app.get_fighter_totals(player, next(cache_keys))
+        app.get_fighter_history(player, next(cache_keys))
+        app.get_rivalries(player, next(cache_keys))
+    else:
+        app.get_available_dates(next(cache_keys))
+        app.get_all_time_stats(next(cache_keys))
+        for stat in dashboard_queries.LEADERBOARD_STATS:
+            app.get_all_time_leaderboard(stat, next(cache_keys))
+        app.get_all_daily_winners(next(cache_keys))
+        app.get_all_players(next(cache_keys))
+    return app.read(dashboard_queries.data_version)
+
+
+def reader(dates, players, stop, latencies, errors, versions):
+    for page in itertools.cycle(("battle", "fighter", "index")):
+        if stop.is_set():
+            break
+        start = time.perf_counter()
+        try:
+            versions.add(read_once(page, dates, players))
+        except sqlite3.Error as e:
+            errors.append(f"{page}: {e}")
+            continue
+        latencies.append((page, time.perf_counter() - start))
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--db", default=os.path.join(REPO_DIR, udb.DB_PATH),
+                        help="database to copy and ingest into (left untouched)")
+    parser.add_argument("--fighters", type=int, default=20_000)
+    parser.add_argument("--hits", type=int, default=100, help="hits taken by each fighter")
+    parser.add_argument("--readers", type=int, default=4, help="dashboard reader threads")
+    parser.add_argument("--max-read-seconds", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "daily_stats.db")
+        shutil.copyfile(args.db, db_path)
+        log_dir = os.path.join(tmp_dir, "simulations")
+        os.mkdir(log_dir)
+        write_collision_log(os.path.join(log_dir, f"20990101_000000{udb.LOG_SUFFIX}"), args.fighters,
+                            hits_per_player=(args.hits, args.hits))
+
+        # Switch the copy to WAL up front, as any earlier ingest would have
+        udb.connect_for_load(db_path).close()
+        app.DB_PATH = db_path
+        app.USE_SNAPSHOTS = False
+        app.get_pool.clear()
+        dates = app.read(dashboard_queries.available_dates)
+        players = app.read(dashboard_queries.all_players)
+        start_version = app.read(dashboard_queries.data_version)
+        if not dates or not players:
+            sys.exit(f"{args.db} has no battles to read")
+
+        stop = threading.Event()
+        latencies, errors, versions = [], [], set()
+        threads = [
+            threading.Thread(target=reader, args=(dates, players, stop, latencies, errors, versions))
+            for _ in range(args.readers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        start = time.perf_counter()
+        ingest = subprocess.run(
+            [sys.executable, os.path.join(REPO_DIR, "update_database.py"),
+             "--log-dir", log_dir, "--db", db_path,
+             "--manifest", os.path.join(tmp_dir, "processed_files.json"),
+             "--archive-dir", os.path.join(tmp_dir, "log_archive"),
+             "--snapshot-dir", os.path.join(tmp_dir, "snapshots")],
+            capture_output=True, text=True,
+        )
+        ingest_seconds = time.perf_counter() - start
+        # Keep reading briefly so the readers pick up the committed battle
+        time.sleep(0.5)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        # Drop the pool, and with it its connections, before the temp dir goes
+        app.get_pool.clear()
+
+        wal_path = db_path + "-wal"
+        wal_bytes = os.path.getsize(wal_path) if os.path.exists(wal_path) else 0
+
+    print(f"Ingested {args.fighters:,} fighters x {args.hits} hits in {ingest_seconds:.1f}s "
+          f"with {args.readers} readers")
+    print(f"{'page':>8} {'reads':>7} {'p50 (ms)':>9} {'p99 (ms)':>9} {'max (ms)':>9}")
+    for page in ("battle", "fighter", "index"):
+        seconds = [elapsed for name, elapsed in latencies if name == page]
+        if seconds:
+            print(f"{page:>8} {len(seconds):>7} {percentile(seconds, 50) * 1000:>9.1f} "
+                  f"{percentile(seconds, 99) * 1000:>9.1f} {max(seconds) * 1000:>9.1f}")
+
+    failures = []
+    if ingest.returncode != 0 or "❌" in ingest.stdout:
+        failures.append(f"ingest failed:\n{ingest.stdout}{ingest.stderr}")
+    if errors:
+        failures.append(f"{len(errors)} reads failed, e.g. {errors[0]}")
+    slowest = max((elapsed for _, elapsed in latencies), default=0.0)
+    if slowest > args.max_read_seconds:
+        failures.append(f"slowest read took {slowest:.2f}s (bound {args.max_read_seconds:g}s)")
+    if max(versions, default=start_version) <= start_version:
+        failures.append("readers never saw the ingested battle")
+    if wal_bytes:
+        failures.append(f"ingest left {wal_bytes:,} bytes in the WAL")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Query-plan regression check for the dashboard's SQL.
+
+Collects every SQL statement literal in the dashboard source, runs
+``EXPLAIN QUERY PLAN`` on it against a database created by
+``update_database.ensure_schema`` and against the shipped database (or the
+ones given with ``--db``), and exits non-zero if any statement falls back
+to a full table scan, i.e. a ``SCAN <table>`` step that does not use an
+index. Every ``SCAN`` step fails, including ``SCAN t USING [COVERING]
+INDEX ...`` (a walk over a whole index is a full scan too), unless it is
+listed in ALLOWED_SCANS for that function with the reason it is bounded.
+The shipped database matters because it has planner statistics
+(sqlite_stat1) that a fresh schema lacks, and they can change the plan.
+
+Usage: python benchmarks/check_query_plans.py [--db PATH ...] [-v]
+"""
+
+import argparse
+import ast
+import itertools
+import os
+import re
+import sqlite3
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import update_database as udb
+
+DASHBOARD_FILES = [
+    "streamlit_app_Final.py",
+    "dashboard_data.py",
+    "dashboard_queries.py",
+    "dashboard_widgets.py",
+    "dashboard_sections/daily_battles.py",
+    "dashboard_sections/all_time_stats.py",
+    "dashboard_sections/fighter_analysis.py",
+    "dashboard_sections/live.py",
+]
+
+# Values substituted for f-string fields in SQL, e.g. the stat column name
+# interpolated by get_top_players(); every combination is checked
+FORMAT_VALUES = {
+    "stat": ["kills", "damage_dealt"],
+}
+
+# (function, plan step) -> why that scan is acceptable
+ALLOWED_SCANS = {
+    ("load_live_battle", "SCAN l USING INDEX idx_live_stats_kills"):
+        "walks the kills index from the top and stops after LIVE_TOP_N rows",
+    ("all_time_leaderboard", "SCAN t USING INDEX idx_player_totals_kills"):
+        "walks the kills index from the top and stops after TOP_N rows",
+    ("all_time_leaderboard", "SCAN t USING INDEX idx_player_totals_damage"):
+        "walks the damage index from the top and stops after TOP_N rows",
+    ("available_dates", "SCAN daily_summary USING COVERING INDEX sqlite_autoindex_daily_summary_1"):
+        "lists every battle date by design, one row per battle",
+    ("all_players", "SCAN p USING COVERING INDEX sqlite_autoindex_players_1"):
+        "lists every fighter by design, for the all-time search index built once per data version",
+    ("rivalries", "SCAN (subquery-5)"):
+        "reads the fighter's own head-to-head rows gathered by the subquery, not a table",
+}
+
+# Upper-case keywords only, so UI text like "Select a player" is skipped
+SQL_START = re.compile(r"^\s*(SELECT|WITH)\s")
+SCAN_STEP = re.compile(r"^SCAN ")
+
+
+def _expand(node):
+    """All concrete SQL strings for a str constant or f-string node."""
+    if isinstance(node, ast.Constant):
+        return [node.value]
+    fields = sorted({ast.unparse(part.value) for part in node.values
+                     if isinstance(part, ast.FormattedValue)})
+    for name in fields:
+        if name not in FORMAT_VALUES:
+            raise KeyError(f"no FORMAT_VALUES entry for f-string field {{{name}}}")
+    variants = []
+    for values in itertools.product(*(FORMAT_VALUES[name] for name in fields)):
+        substitutions = dict(zip(fields, values))
+        variants.append("".join(
+            part.value if isinstance(part, ast.Constant) else substitutions[ast.unparse(part.value)]
+            for part in node.values
+        ))
+    return variants
+
+
+def _enclosing_functions(tree):
+    """id(node) -> name of the innermost function containing it."""
+    owners = {}
+    functions = [node for node in ast.walk(tree) if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))]
+    # Outer functions first, so nested ones overwrite them
+    for function in sorted(functions, key=lambda node: node.lineno):
+        for node in ast.walk(function):
+            owners[id(node)] = function.name
+    return owners
+
+
+def collect_statements(paths):
+    """(location, function, sql) for every SQL statement literal in ``paths``."""
+    statements = []
+    for path in paths:
+        with open(os.path.join(REPO_DIR, path)) as f:
+            tree = ast.parse(f.read(), filename=path)
+        owners = _enclosing_functions(tree)
+        # Literal pieces of an f-string are checked as part of the whole
+        fragments = {id(part) for node in ast.walk(tree) if isinstance(node, ast.JoinedStr)
+                     for part in node.values}
+        for node in ast.walk(tree):
+            if id(node) in fragments:
+                continue
+            if isinstance(node, ast.JoinedStr):
+                head = node.values[0] if node.values else None
+                if not (isinstance(head, ast.Constant) and SQL_START.match(head.value)):
+                    continue
+            elif not (isinstance(node, ast.Constant) and isinstance(node.value, str)
+                      and SQL_START.match(node.value)):
+                continue
+            for sql in _expand(node):
+                statements.append((f"{path}:{node.lineno}", owners.get(id(node)), sql))
+    return statements
+
+
+def full_scans(conn, function, sql):
+    """Plan steps that scan a table or index not allowed for ``function``,
+    and the whole plan."""
+    plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, [None] * sql.count("?"))]
+    return [step for step in plan if SCAN_STEP.match(step) and (function, step) not in ALLOWED_SCANS], plan
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", action="append", default=[],
+                        help="check against this database (repeatable; default: a fresh schema "
+                             "and the shipped database)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print every plan")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        databases = args.db
+    else:
+        shipped = os.path.join(REPO_DIR, udb.DB_PATH)
+        databases = [None] + ([shipped] if os.path.exists(shipped) else [])
+
+    failures = 0
+    statements = collect_statements(DASHBOARD_FILES)
+    for db_path in databases:
+        if db_path:
+            conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        else:
+            conn = sqlite3.connect(":memory:")
+            udb.ensure_schema(conn)
+        print(f"{db_path or 'fresh schema'}:")
+        for location, function, sql in statements:
+            scans, plan = full_scans(conn, function, sql)
+            if scans or args.verbose:
+                print(f"{'FAIL' if scans else 'ok  '} {location}: {' '.join(sql.split())[:90]}")
+                for step in plan:
+                    print(f"       {step}")
+            failures += bool(scans)
+        conn.close()
+
+    print(f"{len(statements)} statements checked against {len(databases)} databases, "
+          f"{failures} with full scans ({len(ALLOWED_SCANS)} allowed scans)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
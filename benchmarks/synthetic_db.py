@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Synthetic dashboard database generator for benchmarks.
+
+Writes a daily_stats.db of NUM_BATTLES daily battles with FIGHTERS fighters
+each, through update_database's own writers, so player_stats, ranking
+(with nemesis and victim), head_to_head, percentiles, player_totals,
+daily_summary and the all-time snapshot hold what ingesting the same logs
+would have left. Fighters come from a pool of POOL_FACTOR x FIGHTERS handles
+with Zipf-distributed popularity: a few regulars fight almost every day,
+most handles only now and then.
+
+Usage: python benchmarks/synthetic_db.py OUT.db NUM_BATTLES FIGHTERS [SEED]
+(1,000 battles of 1,000 fighters is 1M player_stats rows)
+"""
+
+import datetime
+import os
+import sqlite3
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import numpy as np
+
+import update_database as udb
+from synthetic_log import make_collision_log
+
+POOL_FACTOR = 5
+ZIPF_EXPONENT = 1.1
+FIRST_DATE = datetime.date(2024, 1, 1)
+
+
+def pick_fighters(rng, log_weights, count):
+    """``count`` distinct pool positions, each drawn with probability
+    proportional to its weight (Gumbel top-k sampling)."""
+    keys = log_weights + rng.gumbel(size=log_weights.size)
+    return np.argpartition(keys, -count)[-count:]
+
+
+def make_database(path, num_battles, fighters, seed=0, pool_factor=POOL_FACTOR, zipf=ZIPF_EXPONENT):
+    """Create ``path`` (which must not exist yet) and fill it with battles."""
+    if os.path.exists(path):
+        raise FileExistsError(path)
+    rng = np.random.default_rng(seed)
+    pool = np.array([f"fighter_{i:07d}" for i in range(fighters * pool_factor)])
+    # Pool position i is the (i+1)th most popular handle
+    log_weights = -zipf * np.log(np.arange(1, pool.size + 1))
+
+    conn = udb.connect_for_load(path)
+    try:
+        udb.ensure_schema(conn)
+        for day in range(num_battles):
+            names = pool[pick_fighters(rng, log_weights, fighters)]
+            aggregator = udb.BattleAggregator()
+            aggregator.add(make_collision_log(fighters, seed=seed * num_battles + day, names=names))
+            final_stats, winner = aggregator.result()
+            date_str = (FIRST_DATE + datetime.timedelta(days=day)).isoformat()
+            # One transaction per battle, as a daily ingest commits
+            with conn:
+                udb.write_battle(conn, date_str, final_stats, winner, aggregator.edges())
+                udb.add_battle_to_totals(conn, final_stats)
+        with conn:
+            udb.refresh_all_time_stats(conn)
+            udb.bump_data_version(conn)
+        # Planner statistics, as PRAGMA optimize leaves a long-lived database
+        conn.execute("ANALYZE")
+        udb.checkpoint_wal(conn)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    out_path, num_battles, fighters = sys.argv[1], int(sys.argv[2]), int(sys.argv[3])
+    seed = int(sys.argv[4]) if len(sys.argv) > 4 else 0
+    make_database(out_path, num_battles, fighters, seed)
+    conn = sqlite3.connect(out_path)
+    (rows,) = conn.execute("SELECT COUNT(*) FROM player_stats").fetchone()
+    (players,) = conn.execute("SELECT COUNT(*) FROM player_totals").fetchone()
+    conn.close()
+    print(f"{out_path}: {num_battles:,} battles, {rows:,} player_stats rows, {players:,} distinct fighters, "
+          f"{os.path.getsize(out_path) / 2**20:,.1f} MiB")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Synthetic collision-log generator for benchmarks.
+
+Produces a log with the same columns as the simulation's
+``*_collision_log.csv`` files and a consistent battle: every particle except
+the winner is eliminated exactly once, only by an opponent that is still
+alive, and its received force adds up to its 100 HP.
+
+Usage: python benchmarks/synthetic_log.py OUT.csv NUM_PARTICLES [SEED]
+"""
+
+import sys
+import numpy as np
+import pandas as pd
+
+MAX_HP = 100.0
+NEIGHBOURHOOD = 64
+
+
+def make_collision_log(num_particles, seed=0, hits_per_player=(2, 8), names=None):
+    """Return a synthetic collision log DataFrame, rows in time order.
+
+    ``names`` (num_particles handles) replaces the default fighter_NNNNNNN.
+    """
+    rng = np.random.default_rng(seed)
+    if names is None:
+        names = [f"fighter_{i:07d}" for i in range(num_particles)]
+    names = np.asarray(names)
+
+    # Elimination order: position i dies at time i, the last one survives
+    order = rng.permutation(num_particles)
+    dying = np.arange(num_particles - 1)
+
+    # Each eliminated player takes a few hits from opponents who outlive them,
+    # drawn from a small neighbourhood the way fighters cluster in the arena
+    hits = rng.integers(hits_per_player[0], hits_per_player[1] + 1, size=dying.size)
+    victim_pos = np.repeat(dying, hits)
+    span = np.minimum(num_particles - 1 - victim_pos, NEIGHBOURHOOD).astype(float)
+    opponent_pos = victim_pos + 1 + np.floor(rng.random(victim_pos.size) * span).astype(int)
+
+    # Split each player's HP across their hits; the last hit is the lethal one
+    weights = rng.random(victim_pos.size) + 0.05
+    totals = np.bincount(victim_pos, weights=weights, minlength=num_particles)
+    force = weights / totals[victim_pos] * MAX_HP
+    starts = np.concatenate(([0], np.cumsum(hits)[:-1]))
+    killed = np.zeros(victim_pos.size, dtype=bool)
+    killed[starts + hits - 1] = True
+
+    # Non-lethal hits land before the death time, lethal ones exactly at it
+    time = rng.random(victim_pos.size) * victim_pos
+    time[killed] = victim_pos[killed]
+
+    # The winner takes a few glancing blows from players still alive then
+    winner_hits = hits_per_player[1]
+    winner_opp = rng.integers(0, num_particles - 1, size=winner_hits)
+    winner_time = rng.random(winner_hits) * winner_opp
+
+    df = pd.DataFrame({
+        "Particle": np.concatenate((names[order[victim_pos]], np.repeat(names[order[-1]], winner_hits))),
+        "Opponent": np.concatenate((names[order[opponent_pos]], names[order[winner_opp]])),
+        "Force Received": np.concatenate((force, rng.random(winner_hits) * 5.0)),
+        "Killed": np.concatenate((killed, np.zeros(winner_hits, dtype=bool))),
+        "_time": np.concatenate((time, winner_time)),
+    })
+    df = df.sort_values("_time", kind="stable").drop(columns="_time").reset_index(drop=True)
+    return df
+
+
+def write_collision_log(path, num_particles, seed=0, hits_per_player=(2, 8)):
+    """Write a synthetic log to ``path`` and return the winner's name."""
+    df = make_collision_log(num_particles, seed, hits_per_player)
+    df.to_csv(path, index=False)
+    alive = set(df["Particle"]) - set(df.loc[df["Killed"], "Particle"])
+    return alive.pop()
+
+
+if __name__ == "__main__":
+    out_path, count = sys.argv[1], int(sys.argv[2])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    print(f"Winner: {write_collision_log(out_path, count, seed)}")
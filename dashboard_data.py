@@ -0,0 +1,391 @@
+"""
+Data access for the dashboard, shared by every section.
+
+Reads go through a process-wide pool of read-only SQLite connections (or
+the JSON snapshots, with ICON_CLASH_DATA_SOURCE=snapshots) and are cached
+per data version. pandas is only imported by the helpers that return a
+DataFrame, so the page header and navigation render before it loads.
+"""
+
+import bisect
+import contextlib
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import streamlit as st
+
+import dashboard_queries
+from dashboard_queries import TOP_N
+from perf_trace import traced
+
+DB_PATH = os.path.join(os.path.dirname(__file__), "data/daily_stats.db")
+SNAPSHOT_DIR = os.path.join(os.path.dirname(__file__), "data/snapshots")
+# "snapshots" serves every page from the JSON files written by
+# `python update_database.py --export`, with no SQLite access per request
+DATA_SOURCE = os.environ.get("ICON_CLASH_DATA_SOURCE", "sqlite")
+USE_SNAPSHOTS = DATA_SOURCE == "snapshots"
+
+# ========= DB HELPERS ========= #
+# Dashboard connections only ever read: memory-map the file so repeat reads
+# come straight from the OS page cache, and give each a larger page cache
+READ_PRAGMAS = (
+    "PRAGMA query_only = ON",
+    "PRAGMA mmap_size = 268435456",  # 256 MiB
+    "PRAGMA cache_size = -16384",    # 16 MiB
+)
+
+# update_database.py keeps the database in WAL mode, so an ingest never
+# blocks these readers. The rare "database is locked" one can still hit
+# (arriving mid-checkpoint, or on a file not yet switched to WAL) is waited
+# out by SQLite for up to READ_BUSY_TIMEOUT seconds, then retried with
+# backoff by retry_on_busy
+READ_BUSY_TIMEOUT = 2.0
+READ_RETRIES = 4
+READ_RETRY_SECONDS = 0.05
+
+def is_busy_error(error):
+    message = str(error).lower()
+    return "locked" in message or "busy" in message
+
+def retry_on_busy(func):
+    """Re-run a database read that failed because the file was busy"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        for attempt in range(READ_RETRIES):
+            try:
+                return func(*args, **kwargs)
+            except sqlite3.OperationalError as e:
+                if attempt == READ_RETRIES - 1 or not is_busy_error(e):
+                    raise
+                time.sleep(READ_RETRY_SECONDS * 2 ** attempt)
+    return wrapper
+
+class ConnectionPool:
+    """Process-wide pool of read-only SQLite connections.
+    
+    Streamlit runs every session's script in its own thread, so a connection
+    is checked out for one query and handed back afterwards; no sqlite3
+    object is ever used by two threads at once. If the database file is
+    replaced (e.g. a redeploy pulls a new daily_stats.db), pooled handles to
+    the old file are dropped.
+    """
+
+    def __init__(self, path, max_idle=8):
+        self.path = path
+        self.max_idle = max_idle
+        self._idle = []
+        self._lock = threading.Lock()
+        self._file_id = None
+
+    def _connect(self):
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False,
+                               timeout=READ_BUSY_TIMEOUT)
+        for pragma in READ_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @contextlib.contextmanager
+    def connection(self):
+        stat = os.stat(self.path)
+        file_id = (stat.st_dev, stat.st_ino)
+        stale = []
+        with self._lock:
+            if file_id != self._file_id:
+                stale, self._idle = self._idle, []
+                self._file_id = file_id
+            conn = self._idle.pop() if self._idle else None
+        for old in stale:
+            old.close()
+        if conn is None:
+            conn = self._connect()
+        
+        try:
+            yield conn
+        except BaseException:
+            conn.close()
+            raise
+        
+        with self._lock:
+            if file_id == self._file_id and len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                conn = None
+        if conn is not None:
+            conn.close()
+
+@st.cache_resource
+def get_pool():
+    return ConnectionPool(DB_PATH)
+
+def get_conn():
+    """Check out a pooled read-only connection: ``with get_conn() as conn:``"""
+    return get_pool().connection()
+
+@contextlib.contextmanager
+def read_snapshot():
+    """Pooled connection inside one read transaction, so several queries
+    see the same committed state even if an ingest lands in between."""
+    with get_conn() as conn:
+        conn.execute("BEGIN")
+        try:
+            yield conn
+        finally:
+            conn.rollback()
+
+@traced(kind="sql")
+@retry_on_busy
+def read(builder, *args):
+    """Run one of dashboard_queries' builders on a pooled connection, in
+    one read transaction"""
+    with read_snapshot() as conn:
+        return builder(conn, *args)
+
+@traced(kind="sql")
+@retry_on_busy
+def query_one(sql, params=()):
+    with get_conn() as conn:
+        return conn.execute(sql, params).fetchone()
+
+@traced()
+def get_data_version():
+    """Changes whenever daily_stats.db is written or replaced.
+    
+    update_database.py bumps meta.data_version in the same transaction as
+    every ingest; the inode covers the file being swapped out by a deploy.
+    Cached queries take it as an argument, so their entries stay valid
+    indefinitely and a new battle simply produces new cache keys.
+    """
+    if USE_SNAPSHOTS:
+        # index.json is replaced by rename, last, on every export
+        stat = os.stat(os.path.join(SNAPSHOT_DIR, "index.json"))
+        return f"{stat.st_ino}-{stat.st_mtime_ns}"
+    return f"{os.stat(DB_PATH).st_ino}-{read(dashboard_queries.data_version)}"
+
+@traced(st.cache_data(max_entries=256))
+def load_snapshot_file(name, version):
+    """One parsed snapshot file, read once per data version"""
+    with open(os.path.join(SNAPSHOT_DIR, name)) as f:
+        return json.load(f)
+
+def load_snapshot_index(version):
+    return load_snapshot_file("index.json", version)
+
+def fighter_snapshot_name(player):
+    return "fighters/" + dashboard_queries.fighter_snapshot_name(player)
+
+@traced(st.cache_data(max_entries=4))
+def get_available_dates(version):
+    if USE_SNAPSHOTS:
+        return load_snapshot_index(version)["dates"]
+    return read(dashboard_queries.available_dates)
+
+@traced(st.cache_data(max_entries=64), rows=lambda battle: len(battle["players"]))
+def load_battle(date_str, version):
+    """Everything the Daily Battles section shows for one battle, in one read.
+    
+    Returns the summary, the top TOP_N players by kills, damage and rank, the
+    sorted player index and per-player stats keyed by name, so switching
+    fighters or leaderboard tabs never goes back to the database.
+    """
+    if USE_SNAPSHOTS:
+        try:
+            return load_snapshot_file(f"battles/{date_str}.json", version)
+        except FileNotFoundError:
+            return {"summary": None, "players": [], "stats": {},
+                    "top": {"kills": [], "damage_dealt": [], "rank": []}}
+    return read(dashboard_queries.battle, date_str)
+
+# Accessors over one load_battle() payload. A section loads the battle
+# once per rerun and passes it in, so every part of the page shows the same
+# data version and nothing goes back to the cache or the database
+
+@traced()
+def get_daily_summary(battle):
+    return battle["summary"]
+
+@traced()
+def get_players(battle):
+    return battle["players"]
+
+@traced()
+def get_top_players(battle, stat="kills", limit=TOP_N):
+    import pandas as pd
+    rows = battle["top"][stat][:limit]
+    return pd.DataFrame(rows, columns=["Player", stat.capitalize()])
+
+@traced()
+def get_player_stats(battle, player):
+    stats = battle["stats"].get(player)
+    if stats:
+        return {key: value for key, value in stats.items() if key != "rank"}
+    return None
+
+@traced()
+def get_player_percentiles(battle, player):
+    """Percent of the battle's field that did at least as well as ``player``
+    on kills, damage dealt and rank (precomputed at ingest)"""
+    stats = battle["stats"].get(player)
+    if stats:
+        return {key: stats.get(key) for key in ("kills_pct", "damage_pct", "rank_pct")}
+    return None
+
+def get_player_rank(battle, player):
+    stats = battle["stats"].get(player)
+    return stats["rank"] if stats else None
+
+@traced()
+def get_normalized_rank(battle, player):
+    """Get the normalized rank (1,2,3,4...) for a player, accounting for gaps in database ranks"""
+    db_rank = get_player_rank(battle, player)
+    
+    if db_rank is None:
+        return None
+    
+    # Normalize rank: convert 0 to 1, 1 to 2, etc.
+    if db_rank == 0:
+        return 1
+    else:
+        return db_rank + 1
+
+@traced(st.cache_data(max_entries=4))
+def get_all_time_stats(version):
+    """All-time highlights, precomputed by update_database.py at ingest"""
+    if USE_SNAPSHOTS:
+        return load_snapshot_index(version)["all_time_stats"]
+    # One row, written in the same transaction as the battle it reflects,
+    # so every number in it is mutually consistent
+    return read(dashboard_queries.all_time_stats)
+
+@traced(st.cache_data(max_entries=4))
+def get_all_daily_winners(version):
+    """Get all daily winners with their dates"""
+    import pandas as pd
+    if USE_SNAPSHOTS:
+        return pd.DataFrame(load_snapshot_index(version)["daily_winners"],
+                            columns=["Date", "Winner", "Participants"])
+    return pd.DataFrame(read(dashboard_queries.daily_winners), columns=["Date", "Winner", "Participants"])
+
+@traced(st.cache_data(max_entries=8))
+def get_all_time_leaderboard(stat, version):
+    """All-time top TOP_N by ``stat`` (kills or damage_dealt) from player_totals"""
+    if USE_SNAPSHOTS:
+        return load_snapshot_index(version)["leaderboards"][stat]
+    return read(dashboard_queries.all_time_leaderboard, stat)
+
+@traced(st.cache_data(max_entries=4))
+def get_all_players(version):
+    """Every fighter who has ever battled, alphabetically"""
+    if USE_SNAPSHOTS:
+        return load_snapshot_index(version)["players"]
+    return read(dashboard_queries.all_players)
+
+@traced(st.cache_data(max_entries=1000))
+def get_fighter_totals(player, version):
+    """One fighter's all-time totals, averages and bests"""
+    if USE_SNAPSHOTS:
+        try:
+            return load_snapshot_file(fighter_snapshot_name(player), version)["totals"]
+        except FileNotFoundError:
+            return None
+    return read(dashboard_queries.fighter_totals, player)
+
+@traced(st.cache_data(max_entries=1000))
+def get_fighter_history(player, version):
+    """One fighter's per-battle rows, newest first"""
+    if USE_SNAPSHOTS:
+        try:
+            return load_snapshot_file(fighter_snapshot_name(player), version)["history"]
+        except FileNotFoundError:
+            return []
+    return read(dashboard_queries.fighter_history, player)
+
+@traced(st.cache_data(max_entries=1000))
+def get_rivalries(player, version):
+    """A fighter's top opponents by damage exchanged, with head-to-head
+    kills and deaths, from the head_to_head edges in both directions"""
+    if USE_SNAPSHOTS:
+        try:
+            return load_snapshot_file(fighter_snapshot_name(player), version).get("rivals", [])
+        except FileNotFoundError:
+            return []
+    return read(dashboard_queries.rivalries, player)
+
+# Fighters listed in the Live standings, and how often the Live view checks
+# for new events
+LIVE_TOP_N = 25
+LIVE_POLL_SECONDS = 2
+
+@traced()
+def get_live_version():
+    """Changes whenever `update_database.py --follow` publishes new standings.
+    
+    Kept apart from get_data_version() so a followed battle does not
+    invalidate every other cached page several times a second.
+    """
+    row = query_one("SELECT value FROM meta WHERE key = 'live_version'")
+    return f"{os.stat(DB_PATH).st_ino}-{row[0] if row else 0}"
+
+@traced(st.cache_data(max_entries=4), rows=lambda live: len(live["standings"]) if live else 0)
+@retry_on_busy
+def load_live_battle(version):
+    """The followed battle's progress and top LIVE_TOP_N fighters by kills
+    (then damage dealt), or None if no battle is being followed"""
+    with read_snapshot() as conn:
+        battle = conn.execute(
+            "SELECT date, log, rows, players, survivors, updated FROM live_battle WHERE id = 1"
+        ).fetchone()
+        if battle is None:
+            return None
+        # CROSS JOIN keeps live_stats outermost: it is empty whenever
+        # ANALYZE runs, so without it the planner would start from every
+        # fighter in players and sort them all
+        standings = conn.execute("""
+            SELECT p.player, l.kills, l.deaths, l.damage_dealt, l.damage_received, l.alive
+            FROM live_stats l
+            CROSS JOIN players p ON p.player_id = l.player_id
+            ORDER BY l.kills DESC, l.damage_dealt DESC
+            LIMIT ?
+        """, (LIVE_TOP_N,)).fetchall()
+    date, log, rows, players, survivors, updated = battle
+    return {"date": date, "log": log, "rows": rows, "players": players,
+            "survivors": survivors, "updated": updated, "standings": standings}
+
+# Most fighters a selector offers at once; typing narrows the list
+SEARCH_LIMIT = 25
+
+class PlayerIndex:
+    """Sorted, case-insensitive prefix index over a list of player handles.
+    
+    Built once per data version and shared by every session, so a search
+    is a binary search plus at most SEARCH_LIMIT steps, and only the
+    matches are sent to the browser.
+    """
+
+    def __init__(self, players):
+        pairs = sorted((player.casefold(), player) for player in players)
+        self._keys = [key for key, _ in pairs]
+        self._players = [player for _, player in pairs]
+
+    def __len__(self):
+        return len(self._players)
+
+    def search(self, text, limit=SEARCH_LIMIT):
+        """Handles starting with ``text`` (an optional leading @ is ignored)"""
+        prefix = text.strip().lstrip("@").casefold()
+        matches = []
+        for i in range(bisect.bisect_left(self._keys, prefix), len(self._keys)):
+            if len(matches) == limit or not self._keys[i].startswith(prefix):
+                break
+            matches.append(self._players[i])
+        return matches
+
+@traced(st.cache_resource(max_entries=16))
+def get_battle_player_index(date_str, version):
+    return PlayerIndex(load_battle(date_str, version)["players"])
+
+@traced(st.cache_resource(max_entries=4))
+def get_all_player_index(version):
+    return PlayerIndex(get_all_players(version))
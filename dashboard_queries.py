@@ -0,0 +1,186 @@
+"""
+The dashboard's SQL and the shaping of its results, in one place.
+
+Each function takes an open sqlite3 connection and returns plain lists,
+tuples and dicts. The dashboard calls them on its pooled read-only
+connections. update_database.py calls the same functions to write the
+JSON snapshots served with ICON_CLASH_DATA_SOURCE=snapshots, so both
+modes show exactly the same thing. The module only uses the standard
+library, so importing it does not slow the dashboard's cold start.
+"""
+
+import hashlib
+
+# Leaderboard length kept per stat, in a battle and all time
+TOP_N = 10
+# Opponents listed in a fighter's Rivalries table
+RIVALS_N = 10
+# Stats an all-time leaderboard can be ordered by (player_totals columns)
+LEADERBOARD_STATS = ("kills", "damage_dealt")
+
+BATTLE_STAT_KEYS = ("kills", "deaths", "damage_dealt", "damage_received", "nemesis", "victim", "rank",
+                    "kills_pct", "damage_pct", "rank_pct")
+
+
+def fighter_snapshot_name(player):
+    """File name of a fighter's snapshot; hashed so any handle is a safe,
+    case-distinct file name."""
+    return hashlib.sha1(player.encode("utf-8")).hexdigest()[:16] + ".json"
+
+
+def data_version(conn):
+    """meta.data_version, bumped by every write to the battles."""
+    (version,) = conn.execute("SELECT value FROM meta WHERE key = 'data_version'").fetchone()
+    return version
+
+
+def available_dates(conn):
+    """Every battle's date, newest first."""
+    return [r[0] for r in conn.execute("SELECT date FROM daily_summary ORDER BY date DESC")]
+
+
+def battle(conn, date_str):
+    """Everything the Daily Battles section shows for one battle.
+
+    The summary, the players in alphabetical order, per-player stats keyed
+    by name, and the top TOP_N by kills, damage dealt and rank. Run it in
+    one read transaction so the summary and the rows agree.
+    """
+    summary = conn.execute(
+        "SELECT num_players, winner FROM daily_summary WHERE date = ?", (date_str,)
+    ).fetchone()
+    # CROSS JOIN fixes the join order: the battle's own player_stats rows,
+    # then each fighter by id, sorted afterwards. Left to itself the planner
+    # walks every fighter who ever played in name order instead
+    rows = conn.execute("""
+        SELECT p.player, ps.kills, ps.deaths, ps.damage_dealt, ps.damage_received,
+               n.player, v.player, r.rank, pp.kills_pct, pp.damage_pct, pp.rank_pct
+        FROM battles b
+        CROSS JOIN player_stats ps ON ps.battle_id = b.battle_id
+        CROSS JOIN players p ON p.player_id = ps.player_id
+        LEFT JOIN players n ON n.player_id = ps.nemesis_id
+        LEFT JOIN players v ON v.player_id = ps.victim_id
+        LEFT JOIN ranking r ON r.battle_id = ps.battle_id AND r.player_id = ps.player_id
+        LEFT JOIN player_percentiles pp ON pp.battle_id = ps.battle_id AND pp.player_id = ps.player_id
+        WHERE b.date = ?
+        ORDER BY p.player ASC
+    """, (date_str,)).fetchall()
+
+    ranked = [row for row in rows if row[7] is not None]
+    # Stable sorts over the alphabetical rows, so ties list alphabetically
+    return {
+        "summary": {"num_players": summary[0], "winner": summary[1]} if summary else None,
+        "players": [row[0] for row in rows],
+        "stats": {row[0]: dict(zip(BATTLE_STAT_KEYS, row[1:])) for row in rows},
+        "top": {
+            "kills": [(row[0], row[1]) for row in sorted(rows, key=lambda r: -r[1])[:TOP_N]],
+            "damage_dealt": [(row[0], row[3]) for row in sorted(rows, key=lambda r: -r[3])[:TOP_N]],
+            "rank": [(row[0], row[7]) for row in sorted(ranked, key=lambda r: r[7])[:TOP_N]],
+        },
+    }
+
+
+def all_time_stats(conn):
+    """The all-time highlights row written at ingest, as a dict (empty if
+    nothing has been ingested)."""
+    cursor = conn.execute("SELECT * FROM all_time_stats WHERE id = 1")
+    row = cursor.fetchone()
+    stats = dict(zip((col[0] for col in cursor.description), row)) if row else {}
+    stats.pop("id", None)
+    return stats
+
+
+def daily_winners(conn):
+    """(date, winner, participants) for every battle, newest first."""
+    return conn.execute("""
+        SELECT date, winner,
+               (SELECT COUNT(*) FROM battles b JOIN player_stats ps ON ps.battle_id = b.battle_id
+                WHERE b.date = ds.date) AS participants
+        FROM daily_summary ds
+        WHERE date IS NOT NULL AND winner IS NOT NULL
+        ORDER BY date DESC
+    """).fetchall()
+
+
+def all_time_leaderboard(conn, stat):
+    """(player, kills, damage_dealt, battles) of the all-time top TOP_N by
+    ``stat``, one of LEADERBOARD_STATS."""
+    if stat not in LEADERBOARD_STATS:
+        raise ValueError(f"unknown leaderboard stat {stat!r}")
+    return conn.execute(f"""
+        SELECT p.player, t.kills, t.damage_dealt, t.battles
+        FROM player_totals t
+        JOIN players p ON p.player_id = t.player_id
+        ORDER BY t.{stat} DESC
+        LIMIT ?
+    """, (TOP_N,)).fetchall()
+
+
+def all_players(conn):
+    """Every fighter who has ever battled, alphabetically."""
+    return [r[0] for r in conn.execute("""
+        SELECT p.player FROM players p
+        JOIN player_totals t ON t.player_id = p.player_id
+        ORDER BY p.player ASC
+    """)]
+
+
+def fighter_totals(conn, player):
+    """One fighter's all-time totals, averages and bests, or None."""
+    return conn.execute("""
+        SELECT
+            t.battles AS battles_fought,
+            t.kills AS total_kills,
+            t.deaths AS total_deaths,
+            t.damage_dealt AS total_damage_dealt,
+            t.damage_received AS total_damage_received,
+            CAST(t.kills AS FLOAT) / t.battles AS avg_kills,
+            CAST(t.deaths AS FLOAT) / t.battles AS avg_deaths,
+            t.damage_dealt / t.battles AS avg_damage_dealt,
+            t.damage_received / t.battles AS avg_damage_received,
+            t.best_kills,
+            t.best_damage,
+            t.best_rank
+        FROM players p
+        JOIN player_totals t ON t.player_id = p.player_id
+        WHERE p.player = ?
+    """, (player,)).fetchone()
+
+
+def fighter_history(conn, player):
+    """One fighter's per-battle (date, rank, kills, deaths, damage dealt,
+    damage received, rank percentile), newest first."""
+    # CROSS JOIN keeps the fighter's own rows first (idx_player_stats_player)
+    # rather than walking every battle in date order to probe for them
+    return conn.execute("""
+        SELECT b.date, r.rank, ps.kills, ps.deaths, ps.damage_dealt, ps.damage_received, pp.rank_pct
+        FROM players p
+        CROSS JOIN player_stats ps ON ps.player_id = p.player_id
+        CROSS JOIN battles b ON b.battle_id = ps.battle_id
+        LEFT JOIN ranking r ON r.battle_id = ps.battle_id AND r.player_id = ps.player_id
+        LEFT JOIN player_percentiles pp ON pp.battle_id = ps.battle_id AND pp.player_id = ps.player_id
+        WHERE p.player = ?
+        ORDER BY b.date DESC
+    """, (player,)).fetchall()
+
+
+def rivalries(conn, player):
+    """A fighter's top RIVALS_N opponents by damage exchanged, with
+    head-to-head kills and deaths, from the head_to_head edges in both
+    directions."""
+    return conn.execute("""
+        SELECT (SELECT player FROM players WHERE player_id = rival_id) AS opponent,
+               COUNT(DISTINCT battle_id) AS battles,
+               SUM(kills), SUM(deaths), SUM(dealt), SUM(taken)
+        FROM (
+            SELECT opponent_id AS rival_id, battle_id, killed AS kills, 0 AS deaths,
+                   damage AS dealt, 0.0 AS taken
+            FROM head_to_head WHERE player_id = (SELECT player_id FROM players WHERE player = ?)
+            UNION ALL
+            SELECT player_id, battle_id, 0, killed, 0.0, damage
+            FROM head_to_head WHERE opponent_id = (SELECT player_id FROM players WHERE player = ?)
+        )
+        GROUP BY rival_id
+        ORDER BY SUM(dealt) + SUM(taken) DESC, opponent ASC
+        LIMIT ?
+    """, (player, player, RIVALS_N)).fetchall()
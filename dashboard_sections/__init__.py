@@ -0,0 +1,7 @@
+"""
+The dashboard's page sections, one module each.
+
+Each module has ``render(data_version, available_dates)``. The main script
+imports a section the first time it is shown, so a cold start only loads
+the code, and the imports, of the section on screen.
+"""
@@ -0,0 +1,122 @@
+"""
+All Time Stats: all-time highlights, leaderboards and every daily winner.
+"""
+
+import pandas as pd
+import streamlit as st
+
+from dashboard_data import get_all_daily_winners, get_all_time_leaderboard, get_all_time_stats
+from table_format import daily_winners_frame, format_handles, format_thousands
+
+
+def render(data_version, available_dates):
+    """Draw the section"""
+    all_time_stats = get_all_time_stats(data_version)
+    
+    # ========= ALL-TIME HIGHLIGHTS ========= #
+    st.markdown('<div class="section-header">🔥 ALL-TIME HIGHLIGHTS</div>', unsafe_allow_html=True)
+
+    # Create a container with consistent styling - Mobile responsive
+    highlight_container = st.container()
+    with highlight_container:
+        # Mobile-friendly highlight cards layout
+        highlight_cols = st.columns(4)
+
+    # Hall of Fame - Most Kills
+    with highlight_cols[0]:
+        st.markdown("### 🏆 Hall of Fame")
+        st.markdown(f"""
+        <div class="mobile-highlight-card" style="background: rgba(255,215,0,0.1); border: 1px solid rgba(255,215,0,0.3); border-radius: 10px; padding: 15px; text-align: center;">
+            <strong>@{all_time_stats['top_killer']}</strong><br>
+            {all_time_stats['top_killer_kills']:,} total kills
+        </div>
+        """, unsafe_allow_html=True)
+
+    # Record Breakers - Highest Single Battle Kills
+    with highlight_cols[1]:
+        st.markdown("### 💀 Record Breakers")
+        st.markdown(f"""
+        <div class="mobile-highlight-card" style="background: rgba(255,0,0,0.1); border: 1px solid rgba(255,0,0,0.3); border-radius: 10px; padding: 15px; text-align: center;">
+            <strong>@{all_time_stats['highest_kills_player']}</strong><br>
+            {all_time_stats['highest_kills_count']} kills in one battle
+        </div>
+        """, unsafe_allow_html=True)
+
+    # Most Damage Dealt
+    with highlight_cols[2]:
+        st.markdown("### 💥 Damage King")
+        st.markdown(f"""
+        <div class="mobile-highlight-card" style="background: rgba(0,123,255,0.1); border: 1px solid rgba(0,123,255,0.3); border-radius: 10px; padding: 15px; text-align: center;">
+            <strong>@{all_time_stats['top_damage_dealer']}</strong><br>
+            {all_time_stats['top_damage_dealt']:,.0f} total damage
+        </div>
+        """, unsafe_allow_html=True)
+
+    # Highest Single Battle Damage
+    with highlight_cols[3]:
+        st.markdown("### 🎯 Damage Record")
+        st.markdown(f"""
+        <div class="mobile-highlight-card" style="background: rgba(128,0,128,0.1); border: 1px solid rgba(128,0,128,0.3); border-radius: 10px; padding: 15px; text-align: center;">
+            <strong>@{all_time_stats['highest_damage_player']}</strong><br>
+            {all_time_stats['highest_damage_amount']:,.0f} damage in one battle
+        </div>
+        """, unsafe_allow_html=True)
+
+    # ========= MAIN CONTENT AREA ========= #
+    # Mobile responsive columns
+    main_col1, main_col2 = st.columns([2, 3])
+
+    with main_col1:
+        # ========= ALL-TIME LEADERBOARD ========= #
+        st.markdown('<div class="section-header">🏆 ALL-TIME LEADERBOARD</div>', unsafe_allow_html=True)
+        
+        # All-time leaderboard type selector
+        all_time_leaderboard_type = st.radio(
+            "Rank by",
+            ["Kills", "Damage"],
+            horizontal=True,
+            label_visibility="collapsed"
+        )
+        
+        # Get all-time leaderboard data based on selected type
+        stat = "kills" if all_time_leaderboard_type == "Kills" else "damage_dealt"
+        rows = get_all_time_leaderboard(stat, data_version)
+        
+        if rows:
+            df = pd.DataFrame(rows, columns=["Player", "Total Kills", "Total Damage", "Battles"])
+            # Insert rank column
+            df.insert(0, "Rank", range(1, len(df) + 1))
+            
+            # Format the data
+            df['Player'] = format_handles(df['Player'])
+            df['Total Kills'] = format_thousands(df['Total Kills'])
+            df['Total Damage'] = format_thousands(df['Total Damage'])
+            
+            # Display as table with mobile wrapper
+            with st.container():
+                st.markdown('<div class="mobile-table-wrapper">', unsafe_allow_html=True)
+                st.table(df.set_index('Rank'))
+                st.markdown('</div>', unsafe_allow_html=True)
+        else:
+            st.info("No all-time data available.")
+
+    with main_col2:
+        # ========= ALL DAILY WINNERS ========= #
+        st.markdown('<div class="section-header">🏆 ALL DAILY WINNERS</div>', unsafe_allow_html=True)
+        
+        winners_df = get_all_daily_winners(data_version)
+        
+        if not winners_df.empty:
+            # Format the dataframe for display, keeping only rows with actual data
+            display_winners = daily_winners_frame(winners_df)
+            
+            if not display_winners.empty:
+                st.dataframe(
+                    display_winners,
+                    use_container_width=True,
+                    height=400
+                )
+            else:
+                st.info("No valid battle data available.")
+        else:
+            st.info("No battle data available yet.")
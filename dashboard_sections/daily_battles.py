@@ -0,0 +1,286 @@
+"""
+Daily Battles: one battle's highlights, leaderboard and per-fighter stats.
+"""
+
+import pandas as pd
+import streamlit as st
+
+from dashboard_data import (
+    get_battle_player_index, get_daily_summary, get_normalized_rank, get_player_percentiles,
+    get_player_stats, get_players, get_top_players, load_battle,
+)
+from dashboard_widgets import player_search
+from table_format import format_handles, format_positions, format_standing, format_thousands
+
+
+def render(data_version, available_dates):
+    """Draw the section for the battle picked from ``available_dates`` (newest first)"""
+    # ========= DATE SELECTION SECTION ========= #
+    st.markdown('<div class="section-header">📅 SELECT BATTLE DATE</div>', unsafe_allow_html=True)
+
+    # Initialize selected date in session state
+    if 'selected_date' not in st.session_state:
+        st.session_state.selected_date = available_dates[0]
+
+    # Mobile-friendly date selection
+    # Show last 3 dates as buttons
+    recent_dates = available_dates[:3] if len(available_dates) >= 3 else available_dates
+    
+    # Create responsive button layout
+    if len(recent_dates) == 1:
+        button_cols = st.columns(1)
+    elif len(recent_dates) == 2:
+        button_cols = st.columns(2)
+    else:
+        button_cols = st.columns(3)
+    
+    # Recent date buttons
+    for idx, (col, date) in enumerate(zip(button_cols, recent_dates)):
+        with col:
+            is_selected = st.session_state.selected_date == date
+            button_type = "primary" if is_selected else "secondary"
+            
+            if st.button(
+                f"⚔️ {date}",
+                key=f"date_{date}",
+                use_container_width=True,
+                type=button_type
+            ):
+                st.session_state.selected_date = date
+                st.rerun()
+    
+    # "More" button for older dates - Mobile friendly
+    if len(available_dates) > 3:
+        older_dates = available_dates[3:]
+        selected_older = st.selectbox(
+            "📆 Older Battles",
+            ["Select..."] + older_dates,
+            key="older_dates",
+            label_visibility="collapsed"
+        )
+        if selected_older != "Select..." and selected_older != st.session_state.selected_date:
+            st.session_state.selected_date = selected_older
+            st.rerun()
+
+    selected_date = st.session_state.selected_date
+    # Loaded once per rerun; everything below reads from this one payload
+    battle = load_battle(selected_date, data_version)
+
+    # ========= BATTLE HIGHLIGHTS ========= #
+    st.markdown('<div class="section-header">🔥 BATTLE HIGHLIGHTS</div>', unsafe_allow_html=True)
+
+    # Create a container with consistent styling - Mobile responsive
+    highlight_container = st.container()
+    with highlight_container:
+        # Mobile-friendly highlight cards layout
+        highlight_cols = st.columns(4)
+
+    # Champion
+    with highlight_cols[0]:
+        summary = get_daily_summary(battle)
+        if summary:
+            st.markdown("### 👑 Champion")
+            with st.container():
+                st.markdown(f"""
+                <div class="mobile-highlight-card" style="background: rgba(0,255,0,0.1); border: 1px solid rgba(0,255,0,0.3); border-radius: 10px; padding: 15px; text-align: center;">
+                    <strong>@{summary['winner']}</strong><br>
+                    Defeated {summary['num_players']-1} fighters
+                </div>
+                """, unsafe_allow_html=True)
+
+    # Most Kills
+    with highlight_cols[1]:
+        top_killer = get_top_players(battle, "kills", 1)
+        if not top_killer.empty:
+            st.markdown("### 💀 Most Lethal")
+            with st.container():
+                st.markdown(f"""
+                <div class="mobile-highlight-card" style="background: rgba(0,123,255,0.1); border: 1px solid rgba(0,123,255,0.3); border-radius: 10px; padding: 15px; text-align: center;">
+                    <strong>@{top_killer.iloc[0]['Player']}</strong><br>
+                    {top_killer.iloc[0]['Kills']} kills
+                </div>
+                """, unsafe_allow_html=True)
+
+    # Most Damage
+    with highlight_cols[2]:
+        top_damage = get_top_players(battle, "damage_dealt", 1)
+        if not top_damage.empty:
+            st.markdown("### 💥 Damage King")
+            with st.container():
+                st.markdown(f"""
+                <div class="mobile-highlight-card" style="background: rgba(0,123,255,0.1); border: 1px solid rgba(0,123,255,0.3); border-radius: 10px; padding: 15px; text-align: center;">
+                    <strong>@{top_damage.iloc[0]['Player']}</strong><br>
+                    {top_damage.iloc[0]['Damage_dealt']:,.0f} dmg
+                </div>
+                """, unsafe_allow_html=True)
+
+    # Total participants
+    with highlight_cols[3]:
+        st.markdown("### 👥 Warriors")
+        total_players = len(get_players(battle))
+        with st.container():
+            st.markdown(f"""
+            <div class="mobile-highlight-card" style="background: rgba(0,123,255,0.1); border: 1px solid rgba(0,123,255,0.3); border-radius: 10px; padding: 15px; text-align: center;">
+                <strong>{total_players}</strong><br>
+                fighters
+            </div>
+            """, unsafe_allow_html=True)
+
+    # ========= MAIN CONTENT AREA ========= #
+    # Mobile responsive columns
+    main_col1, main_col2 = st.columns([2, 3])
+
+    with main_col1:
+        # ========= LEADERBOARD ========= #
+        st.markdown('<div class="section-header">🏆 LEADERBOARD</div>', unsafe_allow_html=True)
+        
+        # Leaderboard type selector
+        leaderboard_type = st.radio(
+            "Rank by",
+            ["Rank", "Kills", "Damage"],
+            horizontal=True,
+            label_visibility="collapsed"
+        )
+        
+        stat_map = {
+            "Rank": "rank",
+            "Kills": "kills",
+            "Damage": "damage_dealt"
+        }
+        
+        # Get top players based on selected type
+        if leaderboard_type == "Rank":
+            # Special handling for rank - from the battle's ranking rows
+            rows = battle["top"]["rank"]
+            
+            if rows:
+                df = pd.DataFrame(rows, columns=["Player", "Rank"])
+                # Normalize ranks: convert 0 to 1, 1 to 2, etc.
+                df['Rank'] = df['Rank'].mask(df['Rank'] == 0, 1)
+                # Add position column for display
+                df.insert(0, "Position", range(1, len(df) + 1))
+                # Format the rank column
+                df['Rank'] = format_positions(df['Rank'])
+                # Format the player column
+                df['Player'] = format_handles(df['Player'])
+                
+                # Display as table with mobile wrapper
+                with st.container():
+                    st.markdown('<div class="mobile-table-wrapper">', unsafe_allow_html=True)
+                    st.table(df.set_index('Position'))
+                    st.markdown('</div>', unsafe_allow_html=True)
+            else:
+                st.info("No ranking data available for this date.")
+        else:
+            # Get top players by kills or damage
+            df = get_top_players(battle, stat_map[leaderboard_type], 10)
+            
+            if not df.empty:
+                # Add position column for display
+                df.insert(0, "Position", range(1, len(df) + 1))
+                # Format the player column
+                df['Player'] = format_handles(df['Player'])
+                # Format the numeric column
+                value_column = df.columns[-1]
+                df[value_column] = format_thousands(df[value_column])
+                
+                # Display as table with mobile wrapper
+                with st.container():
+                    st.markdown('<div class="mobile-table-wrapper">', unsafe_allow_html=True)
+                    st.table(df.set_index('Position'))
+                    st.markdown('</div>', unsafe_allow_html=True)
+            else:
+                st.info(f"No {leaderboard_type.lower()} data available for this date.")
+
+    with main_col2:
+        # ========= FIGHTER ANALYSIS ========= #
+        st.markdown('<div class="section-header">🔍 FIGHTER ANALYSIS</div>', unsafe_allow_html=True)
+        
+        player_index = get_battle_player_index(selected_date, data_version)
+        
+        if len(player_index):
+            st.markdown(f"**Select a fighter to analyze:** (Found {len(player_index)} players)")
+            
+            # Search box narrows the dropdown to the top matches
+            selected_player = player_search(player_index, "player_select", "players")
+            
+            if selected_player:
+                # Get player stats
+                stats = get_player_stats(battle, selected_player)
+                rank = get_normalized_rank(battle, selected_player)
+                standing = get_player_percentiles(battle, selected_player)
+                
+                if stats:
+                    # Player info header
+                    st.markdown(f"### @{selected_player} - Battle Stats")
+                    
+                    # Quick stats row
+                    stat_cols = st.columns(5)
+                    
+                    with stat_cols[0]:
+                        # Normalize rank: convert 0 to 1, 1 to 2, etc.
+                        normalized_rank = rank + 1 if rank == 0 else rank
+                        rank_display = f"#{normalized_rank}"
+                        st.metric("Rank", rank_display)
+                    
+                    with stat_cols[1]:
+                        st.metric("Kills", stats['kills'])
+                    
+                    with stat_cols[2]:
+                        st.metric("Deaths", stats['deaths'])
+                    
+                    with stat_cols[3]:
+                        kd = stats['kills'] / max(stats['deaths'], 1)
+                        st.metric("K/D", f"{kd:.2f}")
+                    
+                    with stat_cols[4]:
+                        efficiency = stats['damage_dealt'] / max(stats['damage_received'], 1)
+                        st.metric("Efficiency", f"{efficiency:.2f}x")
+                    
+                    # Where this fighter stands in the battle's field
+                    if standing and standing['rank_pct'] is not None:
+                        st.caption(
+                            f"📈 {format_standing(standing['rank_pct'])} by rank · "
+                            f"{format_standing(standing['kills_pct'])} by kills · "
+                            f"{format_standing(standing['damage_pct'])} by damage dealt"
+                        )
+                    
+                    # Damage stats in text format
+                    damage_col1, damage_col2 = st.columns(2)
+                    
+                    with damage_col1:
+                        st.markdown(f"""
+                        <div style="background: rgba(0,255,255,0.1); border: 1px solid rgba(0,255,255,0.3); border-radius: 10px; padding: 15px; text-align: center;">
+                            <strong style="color: #00FFFF;">Damage Dealt</strong><br>
+                            <span style="font-size: 1.5rem; font-weight: bold;">{stats['damage_dealt']:,.0f}</span>
+                        </div>
+                        """, unsafe_allow_html=True)
+                    
+                    with damage_col2:
+                        st.markdown(f"""
+                        <div style="background: rgba(255,0,110,0.1); border: 1px solid rgba(255,0,110,0.3); border-radius: 10px; padding: 15px; text-align: center;">
+                            <strong style="color: #FF006E;">Damage Received</strong><br>
+                            <span style="font-size: 1.5rem; font-weight: bold;">{stats['damage_received']:,.0f}</span>
+                        </div>
+                        """, unsafe_allow_html=True)
+                    
+                    # Nemesis and Victim
+                    rival_col1, rival_col2 = st.columns(2)
+                    
+                    with rival_col1:
+                        if stats['nemesis']:
+                            st.error(f"😈 **Killed by:** [@{stats['nemesis']}](https://instagram.com/{stats['nemesis']})")
+                        else:
+                            st.success("🛡️ **Survived the battle!**")
+                    
+                    with rival_col2:
+                        if stats['victim']:
+                            st.info(f"🎯 **Best victim:** [@{stats['victim']}](https://instagram.com/{stats['victim']})")
+                        else:
+                            st.info("☮️ **No eliminations**")
+                else:
+                    st.error(f"❌ **No stats found for @{selected_player}**")
+                    st.write("This player may not have participated in this battle, or there might be a data issue.")
+        else:
+            st.info("⚔️ **No battle data available for the selected date.**")
+            st.write("Please select a different date or check if the data has been processed correctly.")
@@ -0,0 +1,137 @@
+"""
+Fighter Analysis: one fighter's all-time totals, battle history and rivalries.
+"""
+
+import streamlit as st
+
+from dashboard_data import get_all_player_index, get_fighter_history, get_fighter_totals, get_rivalries
+from dashboard_widgets import player_search
+from table_format import HISTORY_COLUMN_CONFIG, RIVALRY_COLUMN_CONFIG, battle_history_frame, rivalries_frame
+
+
+def render(data_version, available_dates):
+    """Draw the section"""
+    st.markdown('<div class="section-header">🔍 ALL-TIME FIGHTER ANALYSIS</div>', unsafe_allow_html=True)
+    
+    # Prefix index over all unique players from all battles
+    all_player_index = get_all_player_index(data_version)
+    
+    if len(all_player_index):
+        st.markdown(f"**Select a fighter for all-time analysis:** (Found {len(all_player_index)} total fighters)")
+        
+        # Player selection
+        selected_player = player_search(all_player_index, "all_time_player_select", "fighters")
+        
+        if selected_player:
+            # Get all-time stats for the player
+            row = get_fighter_totals(selected_player, data_version)
+            
+            if row and row[0] > 0:
+                battles_fought, total_kills, total_deaths, total_damage_dealt, total_damage_received, \
+                avg_kills, avg_deaths, avg_damage_dealt, avg_damage_received, \
+                best_kills, best_damage, best_rank = row
+                
+                # Player info header
+                st.markdown(f"### @{selected_player} - All-Time Stats")
+                
+                # Quick stats row
+                stat_cols = st.columns(4)
+                
+                with stat_cols[0]:
+                    st.metric("Battles", battles_fought)
+                
+                with stat_cols[1]:
+                    total_kd = total_kills / max(total_deaths, 1)
+                    st.metric("Total K/D", f"{total_kd:.2f}")
+                
+                with stat_cols[2]:
+                    avg_kd = avg_kills / max(avg_deaths, 1)
+                    st.metric("Avg K/D", f"{avg_kd:.2f}")
+                
+                with stat_cols[3]:
+                    efficiency = total_damage_dealt / max(total_damage_received, 1)
+                    st.metric("Efficiency", f"{efficiency:.2f}x")
+                
+                # Detailed stats
+                detail_col1, detail_col2 = st.columns(2)
+                
+                with detail_col1:
+                    st.markdown("#### 💀 Kill Statistics")
+                    st.markdown(f"**Total Kills:** {total_kills:,}")
+                    st.markdown(f"**Average Kills/Battle:** {avg_kills:.1f}")
+                    st.markdown(f"**Best Single Battle:** {best_kills}")
+                    st.markdown(f"**Total Deaths:** {total_deaths:,}")
+                    st.markdown(f"**Average Deaths/Battle:** {avg_deaths:.1f}")
+                
+                with detail_col2:
+                    st.markdown("#### 💥 Damage Statistics")
+                    st.markdown(f"**Total Damage Dealt:** {total_damage_dealt:,.0f}")
+                    st.markdown(f"**Average Damage/Battle:** {avg_damage_dealt:,.0f}")
+                    st.markdown(f"**Best Single Battle:** {best_damage:,.0f}")
+                    st.markdown(f"**Total Damage Received:** {total_damage_received:,.0f}")
+                    st.markdown(f"**Average Damage Received/Battle:** {avg_damage_received:,.0f}")
+                
+                # Performance metrics
+                perf_col1, perf_col2 = st.columns(2)
+                
+                with perf_col1:
+                    # Normalize best rank: convert 0 to 1, 1 to 2, etc.
+                    if best_rank is not None:
+                        normalized_best_rank = best_rank + 1 if best_rank == 0 else best_rank + 1
+                        rank_display = f"#{normalized_best_rank}"
+                    else:
+                        rank_display = "N/A"
+                    st.markdown(f"""
+                    <div style="background: rgba(255,215,0,0.1); border: 1px solid rgba(255,215,0,0.3); border-radius: 10px; padding: 15px; text-align: center;">
+                        <strong style="color: #FFD700;">Best Rank</strong><br>
+                        <span style="font-size: 1.5rem; font-weight: bold;">{rank_display}</span>
+                    </div>
+                    """, unsafe_allow_html=True)
+                
+                with perf_col2:
+                    st.markdown(f"""
+                    <div style="background: rgba(0,255,255,0.1); border: 1px solid rgba(0,255,255,0.3); border-radius: 10px; padding: 15px; text-align: center;">
+                        <strong style="color: #00FFFF;">Damage Efficiency</strong><br>
+                        <span style="font-size: 1.5rem; font-weight: bold;">{efficiency:.2f}x</span>
+                    </div>
+                    """, unsafe_allow_html=True)
+                
+                # Battle history
+                st.markdown("#### 📊 Battle History")
+                history_rows = get_fighter_history(selected_player, data_version)
+                
+                if history_rows:
+                    # Numbers stay numeric; the browser formats visible rows
+                    history_df = battle_history_frame(history_rows)
+                    
+                    st.dataframe(
+                        history_df,
+                        column_config=HISTORY_COLUMN_CONFIG,
+                        use_container_width=True,
+                        height=300
+                    )
+                else:
+                    st.info("No battle history available.")
+                
+                # Rivalries
+                st.markdown("#### ⚔️ Rivalries")
+                rival_rows = get_rivalries(selected_player, data_version)
+                
+                if rival_rows:
+                    rival, battles, kills, deaths = rival_rows[0][:4]
+                    st.markdown(f"**Biggest rival:** @{rival} · met in {battles} battles · "
+                                f"head-to-head {kills}–{deaths}")
+                    st.dataframe(
+                        rivalries_frame(rival_rows),
+                        column_config=RIVALRY_COLUMN_CONFIG,
+                        hide_index=True,
+                        use_container_width=True
+                    )
+                else:
+                    st.info("No head-to-head data yet; rivalries are recorded for battles ingested from now on.")
+            else:
+                st.error(f"❌ **No all-time stats found for @{selected_player}**")
+                st.write("This player may not have participated in any battles, or there might be a data issue.")
+    else:
+        st.info("⚔️ **No player data available.**")
+        st.write("Please check if the database has been populated with battle data.")
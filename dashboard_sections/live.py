@@ -0,0 +1,52 @@
+"""
+Live: running standings of the battle `update_database.py --follow` is tailing.
+"""
+
+from datetime import datetime
+
+import streamlit as st
+
+from dashboard_data import LIVE_TOP_N, USE_SNAPSHOTS, get_live_version, load_live_battle
+from table_format import LIVE_COLUMN_CONFIG, live_standings_frame
+
+
+def render(data_version, available_dates):
+    """Draw the section; returns the live version to wait on before the
+    next rerun if a battle is being followed and auto-refresh is on, else
+    None"""
+    st.markdown('<div class="section-header">🔴 LIVE BATTLE</div>', unsafe_allow_html=True)
+    
+    if USE_SNAPSHOTS:
+        st.info("📡 Live standings are read from the database, so they are not available in snapshot mode.")
+    else:
+        live_version = get_live_version()
+        live = load_live_battle(live_version)
+        
+        if live is None:
+            st.info("📡 **No battle in progress.** Standings appear here as soon as "
+                    "`python update_database.py --follow` starts tailing a running simulation.")
+            # Nothing to wait on: a click reruns the script and checks again
+            st.button("🔄 Check again", key="live_check_again")
+        else:
+            live_cols = st.columns(4)
+            with live_cols[0]:
+                st.metric("📅 Battle", live["date"])
+            with live_cols[1]:
+                st.metric("👥 Fighters", f"{live['players']:,}")
+            with live_cols[2]:
+                st.metric("🟢 Still Standing", f"{live['survivors']:,}")
+            with live_cols[3]:
+                st.metric("💥 Hits So Far", f"{live['rows']:,}")
+            st.caption(f"Last update {datetime.fromtimestamp(live['updated']):%H:%M:%S} from {live['log']}")
+            
+            st.markdown(f"#### 🏆 Top {LIVE_TOP_N} by Kills")
+            st.dataframe(
+                live_standings_frame(live["standings"]),
+                column_config=LIVE_COLUMN_CONFIG,
+                use_container_width=True
+            )
+            
+            # Only a followed battle is polled, so an idle Live tab does not
+            # hold a script thread
+            if st.checkbox("🔄 Auto-refresh", value=True, key="live_auto_refresh"):
+                return live_version
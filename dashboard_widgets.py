@@ -0,0 +1,87 @@
+"""
+Widgets shared by the dashboard's sections.
+"""
+
+import streamlit as st
+
+from dashboard_data import SEARCH_LIMIT
+from perf_trace import traced
+
+def select_exact_match(index, key):
+    """on_change for a search box: pick the typed handle if it exists, so
+    typing a full username is enough, and clear any stale selection."""
+    search = st.session_state[f"{key}_search"]
+    matches = index.search(search, limit=1)
+    if matches and matches[0].casefold() == search.strip().lstrip("@").casefold():
+        st.session_state[key] = matches[0]
+    else:
+        st.session_state[key] = "Type your username:"
+
+def player_search(index, key, noun):
+    """Search box plus a selectbox of the top matches; returns the chosen
+    handle or None."""
+    search = st.text_input(
+        "Search",
+        placeholder="Type your username...",
+        label_visibility="collapsed",
+        key=f"{key}_search",
+        on_change=select_exact_match,
+        args=(index, key),
+    )
+    matches = index.search(search)
+    
+    selected_player = st.selectbox(
+        "Select a player",
+        ["Type your username:"] + matches,
+        format_func=lambda x: x if x == "Type your username:" else f"@{x}",
+        label_visibility="collapsed",
+        key=key,
+        index=0
+    )
+    
+    if not matches:
+        st.caption(f"No {noun} found starting with \"{search.strip()}\".")
+    elif len(matches) == SEARCH_LIMIT:
+        st.caption(f"Showing the first {SEARCH_LIMIT} {noun}. Keep typing to narrow the list.")
+    else:
+        st.caption(f"Showing {len(matches)} matching {noun}.")
+    
+    if selected_player == "Type your username:":
+        return None
+    return selected_player
+
+def get_rank_emoji(rank):
+    if rank == 0: return "👑"
+    elif rank == 1: return "🥇"
+    elif rank == 2: return "🥈"
+    elif rank == 3: return "🥉"
+    elif rank and rank <= 10: return "⭐"
+    else: return "⚔️"
+
+@traced(kind="chart")
+def create_mini_damage_chart(damage_dealt, damage_received):
+    # Deferred: plotly only loads once a chart is actually drawn
+    import plotly.graph_objects as go
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Bar(
+        x=['Dealt', 'Received'],
+        y=[damage_dealt, damage_received],
+        marker_color=['#00FFFF', '#FF006E'],
+        text=[f"{damage_dealt:.0f}", f"{damage_received:.0f}"],
+        textposition='outside'
+    ))
+    
+    fig.update_layout(
+        showlegend=False,
+        height=200,
+        margin=dict(l=0, r=0, t=0, b=0),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='white', size=10),
+        yaxis=dict(showgrid=False, showticklabels=False),
+        xaxis=dict(showgrid=False)
+    )
+    
+    return fig
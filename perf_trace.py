@@ -0,0 +1,162 @@
+"""
+Per-rerun timing for the dashboard.
+
+Each rerun of the dashboard script can record a RerunTrace. It is kept per
+thread, since Streamlit runs every session's script in a thread of its own.
+Functions decorated with :func:`traced` add a span with their wall time, the
+rows they returned and, for cached ones, whether the call was served from
+the cache; each page section adds one span too. Nested calls (a helper
+inside a cached loader) are recorded with their depth, so a cache miss
+shows where its time went.
+
+Nothing is recorded unless the rerun was started with ``enabled=True``;
+otherwise the decorators cost one attribute lookup per call. The dashboard
+shows the finished trace in its hidden performance panel (``?perf=1``) and
+appends it to ICON_CLASH_PERF_LOG, one JSON line per rerun, when that is set.
+"""
+
+import datetime
+import functools
+import json
+import threading
+import time
+
+_local = threading.local()
+_log_lock = threading.Lock()
+
+
+class RerunTrace:
+    """Spans recorded during one rerun of the dashboard script."""
+
+    def __init__(self):
+        self.started = datetime.datetime.now().isoformat(timespec="milliseconds")
+        self.start = time.perf_counter()
+        self.spans = []
+        self.depth = 0
+        self.misses = 0
+        self.section = None
+        self.section_start = None
+
+    def add(self, kind, name, start, rows=None, cache=None):
+        """Record a span that began at perf_counter() ``start`` and ends now."""
+        self.spans.append({
+            "kind": kind, "name": name, "depth": self.depth,
+            "at_ms": round((start - self.start) * 1000, 3),
+            "ms": round((time.perf_counter() - start) * 1000, 3),
+            "rows": rows, "cache": cache,
+        })
+
+    def record(self):
+        """The trace as one JSON-serializable dict, spans in start order,
+        with per-kind totals over top-level spans only (so nested calls are
+        not counted twice)."""
+        top = [span for span in self.spans if span["depth"] == 0]
+        cached = [span for span in self.spans if span["cache"] is not None]
+        return {
+            "started": self.started,
+            "section": self.section,
+            "total_ms": round((time.perf_counter() - self.start) * 1000, 3),
+            "ms_by_kind": {
+                kind: round(sum(span["ms"] for span in top if span["kind"] == kind), 3)
+                for kind in dict.fromkeys(span["kind"] for span in top)
+            },
+            "cache_hits": sum(span["cache"] == "hit" for span in cached),
+            "cache_misses": sum(span["cache"] == "miss" for span in cached),
+            "spans": sorted(self.spans, key=lambda span: span["at_ms"]),
+        }
+
+
+def current():
+    """This thread's RerunTrace, or None if tracing is off."""
+    return getattr(_local, "trace", None)
+
+
+def start_rerun(enabled=True):
+    """Begin a rerun's trace (or clear a stale one when not ``enabled``)."""
+    _local.trace = RerunTrace() if enabled else None
+
+
+def start_section(name):
+    """Mark the start of the page section rendered by this rerun."""
+    trace = current()
+    if trace is not None:
+        trace.section = name
+        trace.section_start = time.perf_counter()
+
+
+def end_section():
+    """Close the section span opened by start_section."""
+    trace = current()
+    if trace is not None and trace.section_start is not None:
+        trace.add("section", trace.section, trace.section_start)
+        trace.section_start = None
+
+
+def finish_rerun(log_path=None):
+    """End this rerun's trace and return its record (None if tracing was
+    off), appending it as one JSON line to ``log_path`` if given."""
+    trace = current()
+    if trace is None:
+        return None
+    _local.trace = None
+    record = trace.record()
+    if log_path:
+        line = json.dumps(record, default=str)
+        with _log_lock, open(log_path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+    return record
+
+
+def count_rows(result):
+    """Rows in a helper's result: the length of a list, DataFrame or index,
+    1 for a single row or record, 0 for None."""
+    if result is None:
+        return 0
+    if isinstance(result, (tuple, dict, str)):
+        return 1
+    try:
+        return len(result)
+    except TypeError:
+        return 1
+
+
+def traced(cache=None, kind="query", rows=count_rows):
+    """Decorator recording a span for every call while a rerun is traced.
+
+    ``cache`` is a configured Streamlit cache decorator, e.g.
+    ``traced(st.cache_data(max_entries=64))``. It is applied inside the
+    timing, so the span tells a cache hit (the body did not run) from a miss.
+    ``rows`` maps the result to the row count recorded.
+    """
+    def decorate(func):
+        if cache is None:
+            inner = func
+        else:
+            @functools.wraps(func)
+            def compute(*args, **kwargs):
+                trace = current()
+                if trace is not None:
+                    trace.misses += 1
+                return func(*args, **kwargs)
+            inner = cache(compute)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            trace = current()
+            if trace is None:
+                return inner(*args, **kwargs)
+            misses = trace.misses
+            trace.depth += 1
+            start = time.perf_counter()
+            try:
+                result = inner(*args, **kwargs)
+            finally:
+                trace.depth -= 1
+            hit = None if cache is None else ("hit" if trace.misses == misses else "miss")
+            trace.add(kind, func.__name__, start, rows(result), hit)
+            return result
+
+        if cache is not None:
+            wrapper.clear = inner.clear
+        return wrapper
+    return decorate
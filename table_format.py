@@ -0,0 +1,151 @@
+"""
+Table formatting for the dashboard.
+
+Everything here works on whole columns. Tables that grow with history
+(a fighter's Battle History, the Daily Winners list) keep their numbers
+numeric and get a ``column_config`` instead, so Streamlit formats only
+the rows the browser actually shows.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from perf_trace import traced
+
+HISTORY_COLUMNS = ["Date", "Rank", "Kills", "Deaths", "Damage Dealt", "Damage Received", "Standing"]
+
+HISTORY_COLUMN_CONFIG = {
+    "Rank": st.column_config.NumberColumn("Rank", format="#%d"),
+    "Standing": st.column_config.NumberColumn("Standing", format="Top %d%%"),
+    "K/D": st.column_config.NumberColumn("K/D", format="%.2f"),
+    "Efficiency": st.column_config.NumberColumn("Efficiency", format="%.2fx"),
+}
+
+RIVALRY_COLUMNS = ["Opponent", "Battles", "Kills", "Deaths", "Damage Dealt", "Damage Taken"]
+
+RIVALRY_COLUMN_CONFIG = {
+    "Kills": st.column_config.NumberColumn("Kills", help="Times you eliminated them"),
+    "Deaths": st.column_config.NumberColumn("Deaths", help="Times they eliminated you"),
+    "Damage Dealt": st.column_config.NumberColumn("Damage Dealt", format="%.0f"),
+    "Damage Taken": st.column_config.NumberColumn("Damage Taken", format="%.0f"),
+}
+
+LIVE_COLUMNS = ["Fighter", "Kills", "Deaths", "Damage Dealt", "Damage Received", "Status"]
+
+LIVE_COLUMN_CONFIG = {
+    "Damage Dealt": st.column_config.NumberColumn("Damage Dealt", format="%.0f"),
+    "Damage Received": st.column_config.NumberColumn("Damage Received", format="%.0f"),
+}
+
+PERF_SPAN_COLUMNS = ["Start (ms)", "Kind", "Call", "Time (ms)", "Rows", "Cache"]
+
+PERF_COLUMN_CONFIG = {
+    "Start (ms)": st.column_config.NumberColumn("Start (ms)", format="%.1f"),
+    "Time (ms)": st.column_config.NumberColumn("Time (ms)", format="%.2f"),
+}
+
+
+def format_handles(names):
+    """@-prefixed handles for a Series of player names."""
+    return "@" + names.astype("str")
+
+
+def format_positions(ranks):
+    """#-prefixed positions for a Series of whole numbers."""
+    return "#" + ranks.astype("int64").astype("str")
+
+
+def format_standing(pct):
+    """'Top N%' for a percentile from player_percentiles, rounded up so the
+    winner of a big battle reads 'Top 1%' rather than 'Top 0%'."""
+    if pct is None:
+        return None
+    return f"Top {math.ceil(pct)}%"
+
+
+def format_thousands(values):
+    """Whole numbers with thousands separators, for short tables only.
+
+    Used on the 10-row leaderboards rendered with ``st.table``, which has
+    no column_config; anything longer should use a NumberColumn instead.
+    Built from a matrix of digit characters rather than formatted cell by
+    cell; -0.5 comes out as "0", not "-0".
+    """
+    whole = values.astype("float64").round().astype("int64").to_numpy()
+    magnitude = np.abs(whole)
+    width = len(str(magnitude.max())) if len(whole) else 1
+    # One row of ASCII digits per value, with a comma column before every
+    # third digit from the right
+    digits = magnitude[:, None] // 10 ** np.arange(width - 1, -1, -1, dtype="int64") % 10
+    commas = np.arange(width - 3, 0, -3)
+    chars = np.insert((digits + ord("0")).astype("uint8"), commas, ord(","), axis=1)
+    # Blank the leading zeros, and the commas among them, then strip them
+    leading = np.cumsum(np.insert(digits, commas, 0, axis=1), axis=1) == 0
+    leading[:, -1] = False
+    chars[leading] = ord(" ")
+    text = np.char.lstrip(chars.view(f"S{chars.shape[1]}").ravel()).astype("str")
+    return pd.Series(np.char.add(np.where(whole < 0, "-", ""), text), index=values.index, dtype="str")
+
+
+@traced(kind="format")
+def battle_history_frame(rows):
+    """A fighter's per-battle rows as a display-ready DataFrame.
+
+    Rank is normalized (0 -> 1, 1 -> 2, ...), Standing is rounded up as in
+    format_standing, and K/D and Efficiency are computed, all as numbers;
+    pair with HISTORY_COLUMN_CONFIG.
+    """
+    history_df = pd.DataFrame(rows, columns=HISTORY_COLUMNS)
+    history_df["Rank"] = (history_df["Rank"] + 1).astype("Int64")
+    history_df["Standing"] = np.ceil(history_df["Standing"].astype("float64")).astype("Int64")
+    history_df["K/D"] = history_df["Kills"] / history_df["Deaths"].replace(0, 1)
+    history_df["Efficiency"] = history_df["Damage Dealt"] / history_df["Damage Received"].replace(0, 1)
+    return history_df
+
+
+@traced(kind="format")
+def rivalries_frame(rows):
+    """get_rivalries() rows as a DataFrame; pair with RIVALRY_COLUMN_CONFIG."""
+    rivals_df = pd.DataFrame(rows, columns=RIVALRY_COLUMNS)
+    rivals_df["Opponent"] = format_handles(rivals_df["Opponent"])
+    return rivals_df
+
+
+@traced(kind="format")
+def daily_winners_frame(winners_df):
+    """Daily Winners with @-handles, YYYY-MM-DD dates and a Battle # index
+    (latest battle is the highest number)."""
+    display_winners = winners_df.dropna(subset=["Winner", "Date"]).copy()
+    display_winners["Winner"] = format_handles(display_winners["Winner"])
+    # Older rows may hold YYYYMMDD dates
+    display_winners["Date"] = display_winners["Date"].astype("str").str.replace(
+        r"^(\d{4})(\d{2})(\d{2})$", r"\1-\2-\3", regex=True
+    )
+    display_winners.insert(0, "Battle #", range(len(display_winners), 0, -1))
+    return display_winners.set_index("Battle #")
+
+
+@traced(kind="format")
+def live_standings_frame(rows):
+    """Live standings rows (fighter, kills, deaths, damage dealt, damage
+    received, alive) with @-handles, a status column and a 1-based #
+    index; pair with LIVE_COLUMN_CONFIG."""
+    live_df = pd.DataFrame(rows, columns=LIVE_COLUMNS)
+    live_df["Fighter"] = format_handles(live_df["Fighter"])
+    live_df["Status"] = np.where(live_df["Status"].astype(bool), "🟢 In the fight", "💀 Eliminated")
+    live_df.index = pd.RangeIndex(1, len(live_df) + 1, name="#")
+    return live_df
+
+
+def perf_spans_frame(spans):
+    """A rerun's trace spans (see perf_trace) in start order, calls made by
+    another traced call indented under it; pair with PERF_COLUMN_CONFIG."""
+    spans_df = pd.DataFrame(spans, columns=["at_ms", "kind", "name", "ms", "rows", "cache", "depth"])
+    spans_df["name"] = spans_df["depth"].map(lambda depth: "↳ " * depth) + spans_df["name"]
+    spans_df["rows"] = spans_df["rows"].astype("Int64")
+    spans_df = spans_df.drop(columns="depth")
+    spans_df.columns = PERF_SPAN_COLUMNS
+    return spans_df
@@ -2,89 +2,1620 @@
 """
 Helper script to process simulation logs and update the database.
 Run this after completing a simulation to update the database for Streamlit Cloud.
+
+Every collision log in simulations/ that is not yet listed in the processed-logs
+manifest is ingested, oldest first, so re-running the script is a no-op and a
+backfill of several missed nights is a single command.
 """
 
+import argparse
+import collections
+import concurrent.futures
+import functools
 import sqlite3
+import numpy as np
 import pandas as pd
 import os
-from datetime import datetime
+import json
 import glob
+import io
+import itertools
+import tempfile
+import time
+
+import dashboard_queries
+
+SIMULATIONS_DIR = "simulations"
+DB_PATH = "data/daily_stats.db"
+MANIFEST_PATH = "data/processed_logs/processed_files.json"
+SNAPSHOT_DIR = "data/snapshots"
+ARCHIVE_DIR = "data/log_archive"
+LOG_SUFFIX = "_collision_log.csv"
+
+
+# ========= SCHEMA ========= #
+# Player names and battle dates are interned once, in players and battles;
+# every per-battle table is keyed on their integer ids, which keeps rows
+# and indexes small and makes joins and GROUP BY player integer compares.
+TABLES = """
+    CREATE TABLE IF NOT EXISTS players (
+        player_id INTEGER PRIMARY KEY,
+        player TEXT NOT NULL UNIQUE
+    );
+    CREATE TABLE IF NOT EXISTS battles (
+        battle_id INTEGER PRIMARY KEY,
+        date TEXT NOT NULL UNIQUE
+    );
+    CREATE TABLE IF NOT EXISTS player_stats (
+        battle_id INTEGER,
+        player_id INTEGER,
+        kills INTEGER,
+        deaths INTEGER,
+        damage_dealt REAL,
+        damage_received REAL,
+        nemesis_id INTEGER,
+        victim_id INTEGER,
+        PRIMARY KEY (battle_id, player_id)
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS daily_summary (
+        date TEXT PRIMARY KEY,
+        num_players INTEGER,
+        winner TEXT
+    );
+    CREATE TABLE IF NOT EXISTS ranking (
+        battle_id INTEGER,
+        player_id INTEGER,
+        rank INTEGER,
+        PRIMARY KEY (battle_id, player_id)
+    ) WITHOUT ROWID;
+    -- All-time per-player aggregates, maintained at ingest so the
+    -- dashboard never has to GROUP BY over player_stats
+    CREATE TABLE IF NOT EXISTS player_totals (
+        player_id INTEGER PRIMARY KEY,
+        battles INTEGER,
+        kills INTEGER,
+        deaths INTEGER,
+        damage_dealt REAL,
+        damage_received REAL,
+        best_kills INTEGER,
+        best_damage REAL,
+        best_rank INTEGER,
+        wins INTEGER,
+        kdr REAL GENERATED ALWAYS AS (
+            CASE WHEN deaths > 0 THEN CAST(kills AS REAL) / deaths ELSE kills END
+        ) VIRTUAL
+    );
+    -- Single-row snapshot of the All Time Stats highlights, rewritten in
+    -- the same transaction as each ingest
+    CREATE TABLE IF NOT EXISTS all_time_stats (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        total_battles INTEGER,
+        total_players INTEGER,
+        first_battle TEXT,
+        last_battle TEXT,
+        top_winner TEXT,
+        top_wins INTEGER,
+        total_kills INTEGER,
+        total_damage REAL,
+        top_killer TEXT,
+        top_killer_kills INTEGER,
+        top_damage_dealer TEXT,
+        top_damage_dealt REAL,
+        top_kdr_player TEXT,
+        top_kdr_ratio REAL,
+        top_kdr_kills INTEGER,
+        most_active_player TEXT,
+        most_active_battles INTEGER,
+        highest_kills_player TEXT,
+        highest_kills_count INTEGER,
+        highest_kills_date TEXT,
+        highest_damage_player TEXT,
+        highest_damage_amount REAL,
+        highest_damage_date TEXT,
+        most_active_day TEXT,
+        most_active_day_battles INTEGER
+    );
+    -- Where each fighter finished within their battle: the percentage of
+    -- the field that did at least as well, so "top X%" is a key lookup
+    CREATE TABLE IF NOT EXISTS player_percentiles (
+        battle_id INTEGER,
+        player_id INTEGER,
+        kills_pct REAL,
+        damage_pct REAL,
+        rank_pct REAL,
+        PRIMARY KEY (battle_id, player_id)
+    ) WITHOUT ROWID;
+    -- One row per (attacker, target) pair per battle: how often and how
+    -- hard ``player_id`` hit ``opponent_id``, and whether it eliminated them
+    CREATE TABLE IF NOT EXISTS head_to_head (
+        player_id INTEGER,
+        opponent_id INTEGER,
+        battle_id INTEGER,
+        hits INTEGER,
+        damage REAL,
+        killed INTEGER,
+        PRIMARY KEY (player_id, opponent_id, battle_id)
+    ) WITHOUT ROWID;
+    -- The battle being followed by --follow while its log is still being
+    -- written, and its running per-fighter totals; both are emptied in the
+    -- transaction that ingests the finished battle
+    CREATE TABLE IF NOT EXISTS live_battle (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        date TEXT,
+        log TEXT,
+        rows INTEGER,
+        players INTEGER,
+        survivors INTEGER,
+        updated REAL
+    );
+    CREATE TABLE IF NOT EXISTS live_stats (
+        player_id INTEGER PRIMARY KEY,
+        kills INTEGER,
+        deaths INTEGER,
+        damage_dealt REAL,
+        damage_received REAL,
+        alive INTEGER
+    );
+    -- Database-level metadata; data_version is bumped by every write
+    -- so the dashboard can key its caches on it (live_version likewise
+    -- by every live update)
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value
+    );
+    INSERT OR IGNORE INTO meta (key, value) VALUES ('data_version', 1);
+"""
+
+# Secondary indexes for the dashboard's read paths. Each one lets a query in
+# streamlit_app_Final.py be answered from the index alone; run
+# benchmarks/check_query_plans.py after changing either side.
+INDEXES = """
+    -- Fighter Analysis history and all-time GROUP BY player
+    CREATE INDEX IF NOT EXISTS idx_player_stats_player
+        ON player_stats (player_id, battle_id, kills, deaths, damage_dealt, damage_received);
+    -- Single-battle records across all history
+    CREATE INDEX IF NOT EXISTS idx_player_stats_kills
+        ON player_stats (kills);
+    CREATE INDEX IF NOT EXISTS idx_player_stats_damage
+        ON player_stats (damage_dealt);
+    -- Rivalries: a fighter's edges in either direction (the primary key
+    -- covers the attacking side)
+    CREATE INDEX IF NOT EXISTS idx_head_to_head_opponent
+        ON head_to_head (opponent_id, player_id, battle_id, hits, damage, killed);
+    -- Most battle wins
+    CREATE INDEX IF NOT EXISTS idx_daily_summary_winner
+        ON daily_summary (winner);
+    -- All-time top-N from the materialized totals
+    CREATE INDEX IF NOT EXISTS idx_player_totals_kills
+        ON player_totals (kills);
+    CREATE INDEX IF NOT EXISTS idx_player_totals_damage
+        ON player_totals (damage_dealt);
+    CREATE INDEX IF NOT EXISTS idx_player_totals_battles
+        ON player_totals (battles);
+    CREATE INDEX IF NOT EXISTS idx_player_totals_kdr
+        ON player_totals (kdr) WHERE kills > 0;
+    -- Live standings
+    CREATE INDEX IF NOT EXISTS idx_live_stats_kills
+        ON live_stats (kills, damage_dealt);
+"""
+
+# Tables that were keyed on player names and dates before players/battles
+# existed. player_totals and player_percentiles are derived, so they are
+# dropped and backfilled rather than converted.
+LEGACY_KEYED_TABLES = ("player_stats", "ranking", "head_to_head", "player_totals", "player_percentiles")
+LEGACY_COPIES = {
+    "player_stats": """
+        INSERT INTO player_stats
+        (battle_id, player_id, kills, deaths, damage_dealt, damage_received, nemesis_id, victim_id)
+        SELECT b.battle_id, p.player_id, l.kills, l.deaths, l.damage_dealt, l.damage_received,
+               n.player_id, v.player_id
+        FROM player_stats_legacy l
+        JOIN battles b ON b.date = l.date
+        JOIN players p ON p.player = l.player
+        LEFT JOIN players n ON n.player = l.nemesis
+        LEFT JOIN players v ON v.player = l.victim;
+    """,
+    "ranking": """
+        INSERT INTO ranking (battle_id, player_id, rank)
+        SELECT b.battle_id, p.player_id, l.rank
+        FROM ranking_legacy l
+        JOIN battles b ON b.date = l.date
+        JOIN players p ON p.player = l.player;
+    """,
+    "head_to_head": """
+        INSERT INTO head_to_head (player_id, opponent_id, battle_id, hits, damage, killed)
+        SELECT p.player_id, o.player_id, b.battle_id, l.hits, l.damage, l.killed
+        FROM head_to_head_legacy l
+        JOIN battles b ON b.date = l.date
+        JOIN players p ON p.player = l.player
+        JOIN players o ON o.player = l.opponent;
+    """,
+}
+# Where each legacy table keeps names and dates
+LEGACY_NAMES = {
+    "player_stats": ("player", "nemesis", "victim"),
+    "ranking": ("player",),
+    "head_to_head": ("player", "opponent"),
+}
+
+
+def intern_legacy_keys(conn):
+    """Convert a database keyed on player names and dates to the
+    players/battles ids, in place and in one transaction.
+
+    Ids are handed out in name and date order. Returns False if the
+    database is already converted (or new).
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(player_stats)")}
+    if "player" not in columns:
+        return False
+    existing = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    legacy = [table for table in LEGACY_KEYED_TABLES if table in existing]
+    copied = [table for table in legacy if table in LEGACY_COPIES]
+
+    names = " UNION ".join(
+        f"SELECT {column} FROM {table}_legacy WHERE {column} IS NOT NULL"
+        for table in copied for column in LEGACY_NAMES[table]
+    )
+    dates = " UNION ".join(f"SELECT date FROM {table}_legacy" for table in copied)
+    script = (
+        ["BEGIN;"]
+        + [f"ALTER TABLE {table} RENAME TO {table}_legacy;" for table in legacy]
+        + [TABLES,
+           f"INSERT INTO players (player) {names} ORDER BY 1;",
+           f"INSERT INTO battles (date) {dates} ORDER BY 1;"]
+        + [LEGACY_COPIES[table] for table in copied]
+        + [f"DROP TABLE {table}_legacy;" for table in legacy]
+        + ["UPDATE meta SET value = value + 1 WHERE key = 'data_version';"]
+    )
+    if "sqlite_stat1" in existing:
+        # Planner statistics still describe the old tables' indexes
+        script.append("DELETE FROM sqlite_stat1 WHERE tbl IN (%s);" % ", ".join(f"'{table}'" for table in legacy))
+    script.append("COMMIT;")
+    # executescript commits first, so the script brackets its own transaction
+    try:
+        conn.executescript("\n".join(script))
+    except BaseException:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    return True
+
+
+def ensure_schema(conn):
+    """Create the dashboard tables and indexes if they do not exist yet,
+    converting a name-keyed database first (see intern_legacy_keys)."""
+    intern_legacy_keys(conn)
+    conn.executescript(TABLES)
+    conn.executescript(INDEXES)
+
+    # Backfill totals for databases that predate the player_totals table
+    if (conn.execute("SELECT 1 FROM player_totals LIMIT 1").fetchone() is None
+            and conn.execute("SELECT 1 FROM player_stats LIMIT 1").fetchone() is not None):
+        with conn:
+            refresh_player_totals(conn)
+    if (conn.execute("SELECT 1 FROM player_percentiles LIMIT 1").fetchone() is None
+            and conn.execute("SELECT 1 FROM player_stats LIMIT 1").fetchone() is not None):
+        with conn:
+            refresh_percentiles(conn)
+            bump_data_version(conn)
+    if conn.execute("SELECT 1 FROM all_time_stats").fetchone() is None:
+        with conn:
+            refresh_all_time_stats(conn)
+
+
+def migrate(db_path=DB_PATH):
+    """Bring an existing database up to the current schema."""
+    conn = connect_for_load(db_path)
+    try:
+        size = os.path.getsize(db_path)
+        converted = intern_legacy_keys(conn)
+        ensure_schema(conn)
+        # Refresh planner statistics for the new indexes
+        conn.execute("PRAGMA optimize")
+        if converted:
+            conn.execute("ANALYZE")
+            # Hand the pages freed by the old name-keyed tables back to the filesystem
+            conn.execute("VACUUM")
+            print(f"🔑 Interned player and battle keys: {size / 2**20:.1f} MB -> "
+                  f"{os.path.getsize(db_path) / 2**20:.1f} MB")
+        checkpoint_wal(conn)
+    finally:
+        conn.close()
+    print(f"✅ Schema up to date: {db_path}")
+
+
+# ========= MANIFEST ========= #
+def load_manifest(manifest_path=MANIFEST_PATH):
+    """Return the set of log filenames that have already been ingested."""
+    if not os.path.exists(manifest_path):
+        return set()
+    with open(manifest_path) as f:
+        return set(json.load(f))
+
+
+def write_json_atomic(path, obj):
+    """Write ``obj`` as JSON via a temp file and rename, so readers only
+    ever see the old file or the complete new one."""
+    out_dir = os.path.dirname(path) or "."
+    os.makedirs(out_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=out_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(obj, f, separators=(",", ":"))
+        # mkstemp creates owner-only files; these are read by other processes
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
 
-def process_simulation_logs():
-    """Process the latest simulation log and update the database."""
-    
-    # Find the latest collision log
-    log_files = glob.glob("simulations/*_collision_log.csv")
-    if not log_files:
-        print("No collision logs found in simulations/ directory")
+def save_manifest(processed, manifest_path=MANIFEST_PATH):
+    """Atomically rewrite the manifest so a crash never leaves it half-written."""
+    write_json_atomic(manifest_path, sorted(processed))
+
+
+def find_unprocessed_logs(log_dir=SIMULATIONS_DIR, manifest_path=MANIFEST_PATH):
+    """List collision logs not yet in the manifest, oldest battle first."""
+    processed = load_manifest(manifest_path)
+    log_files = glob.glob(os.path.join(log_dir, f"*{LOG_SUFFIX}"))
+    # Filenames start with YYYYMMDD_HHMMSS, so name order is battle order
+    return sorted(
+        (path for path in log_files if os.path.basename(path) not in processed),
+        key=os.path.basename,
+    )
+
+
+def log_date(log_path):
+    """Battle date (YYYY-MM-DD) from a YYYYMMDD_HHMMSS_collision_log.csv filename."""
+    stamp = os.path.basename(log_path).split('_')[0]
+    return f"{stamp[:4]}-{stamp[4:6]}-{stamp[6:8]}"
+
+
+# ========= INGEST ========= #
+# The database runs in WAL mode: a load appends its commits to the -wal file
+# while dashboard readers keep reading the last committed state, so an ingest
+# never locks them out. Checkpoint policy: once the WAL passes
+# WAL_AUTOCHECKPOINT_PAGES, each commit copies it back into the database
+# with a passive checkpoint that never waits for readers; every load ends
+# with a TRUNCATE checkpoint (checkpoint_wal), so the database file is
+# complete on its own, and then switches it back to a rollback journal.
+# The committed daily_stats.db is therefore never in WAL mode, which a
+# read-only reader could only open with write access to data/ (to create
+# the -shm file); the next load turns WAL back on.
+WAL_AUTOCHECKPOINT_PAGES = 1000     # ~4 MiB of 4 KiB pages, SQLite's default
+WAL_SIZE_LIMIT = 64 * 2**20         # shrink a -wal file grown past this after a checkpoint
+WRITE_TIMEOUT_SECONDS = 30.0        # wait this long for another writer (e.g. --follow)
+LEAVE_WAL_TIMEOUT_MS = 2000         # wait this long for readers to let go of the WAL
+
+# Connection-scoped settings for the duration of a load; they reset when the
+# connection closes, so the dashboard's own connections are unaffected.
+LOAD_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",   # in WAL mode, fsync at checkpoints only
+    "PRAGMA temp_store = MEMORY",    # keep sort/index temp b-trees off disk
+    "PRAGMA cache_size = -65536",    # 64 MiB page cache
+    f"PRAGMA wal_autocheckpoint = {WAL_AUTOCHECKPOINT_PAGES}",
+    f"PRAGMA journal_size_limit = {WAL_SIZE_LIMIT}",
+)
+
+
+def connect_for_load(db_path=DB_PATH):
+    """Open a connection tuned for bulk loading, switching the database to WAL."""
+    conn = sqlite3.connect(db_path, timeout=WRITE_TIMEOUT_SECONDS)
+    # Stored in the database file, so it holds for every later connection too
+    conn.execute("PRAGMA journal_mode = WAL")
+    for pragma in LOAD_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def checkpoint_wal(conn):
+    """Copy the whole WAL back into the database, then leave WAL mode.
+
+    Waits, up to the connection's busy timeout, for readers still on an
+    older snapshot; one that outlasts it leaves the checkpoint partial, and
+    the next load's finishes the job. Leaving WAL needs every other
+    connection closed, so with dashboard readers still attached the file
+    stays in WAL mode (with an empty -wal) until a later load can switch it.
+    Call it last: the connection is left in rollback-journal mode.
+    """
+    busy, _, _ = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+    if busy:
+        print("⚠️ WAL checkpoint incomplete: readers were busy; the next load will finish it")
         return
-    
-    latest_log = max(log_files, key=os.path.getctime)
-    print(f"Processing: {latest_log}")
-    
-    # Read the collision log
-    df = pd.read_csv(latest_log)
-    
-    # Extract date from filename (format: YYYYMMDD_HHMMSS_collision_log.csv)
-    filename = os.path.basename(latest_log)
-    date_str = filename.split('_')[0] + '_' + filename.split('_')[1]
-    
+    conn.execute(f"PRAGMA busy_timeout = {LEAVE_WAL_TIMEOUT_MS}")
+    try:
+        (mode,) = conn.execute("PRAGMA journal_mode = DELETE").fetchone()
+    except sqlite3.OperationalError:
+        mode = "wal"
+    if mode.lower() == "wal":
+        print("⚠️ Database left in WAL mode: readers still have it open; the next load will switch it back")
+
+
+PLAYER_COLUMNS = ['player', 'kills', 'deaths', 'damage_dealt', 'damage_received', 'nemesis', 'victim', 'rank']
+EDGE_COLUMNS = ['player', 'opponent', 'hits', 'damage', 'killed']
+
+# Narrow dtypes for reading collision logs: player names are repeated on
+# every row, so categoricals hold them as small integer codes per chunk
+LOG_DTYPES = {
+    'Particle': 'category',
+    'Opponent': 'category',
+    'Force Received': 'float32',
+    'Killed': 'bool',
+}
+CHUNK_ROWS = 500_000
+
+
+def _grow(values, size, fill=0):
+    """Extend a per-player array to ``size`` entries."""
+    if len(values) >= size:
+        return values
+    return np.concatenate((values, np.full(size - len(values), fill, dtype=values.dtype)))
+
+
+class BattleAggregator:
+    """Mergeable partial aggregates for one battle's collision log.
+
+    Chunks are fed in log order with :meth:`add`; each is reduced to
+    per-player counters keyed by a stable integer code, so memory is bounded
+    by the number of players and distinct (attacker, target) pairs rather
+    than by the number of log rows. A row means ``Particle`` received
+    ``Force Received`` from ``Opponent``; ``Killed`` marks the hit that
+    eliminated ``Particle``.
+    """
+
+    # (attacker, target) pairs are packed into one int64 key
+    PAIR_SHIFT = 32
+
+    def __init__(self):
+        self.players = pd.Index([], dtype=object)
+        self.kills = np.zeros(0, dtype=np.int64)
+        self.deaths = np.zeros(0, dtype=np.int64)
+        self.damage_dealt = np.zeros(0, dtype=np.float64)
+        self.damage_received = np.zeros(0, dtype=np.float64)
+        self.nemesis = np.zeros(0, dtype=np.int64)
+        # Log row of each player's first lethal hit (-1 while alive); row
+        # order is the log's time order, so this doubles as a timestamp
+        self.death_row = np.zeros(0, dtype=np.int64)
+        self.rows_seen = 0
+        self.pair_keys = np.zeros(0, dtype=np.int64)
+        self.pair_damage = np.zeros(0, dtype=np.float64)
+        self.pair_hits = np.zeros(0, dtype=np.int64)
+        self.pair_kills = np.zeros(0, dtype=np.int64)
+        self._pending_pairs = []
+        self._pending_len = 0
+
+    def _intern(self, column):
+        """Global player codes for one chunk column (-1 where missing)."""
+        if not isinstance(column.dtype, pd.CategoricalDtype):
+            column = column.astype('category')
+        categories = column.cat.categories
+        lookup = self.players.get_indexer(categories)
+        unseen = lookup < 0
+        if unseen.any():
+            lookup[unseen] = np.arange(len(self.players), len(self.players) + unseen.sum())
+            self.players = self.players.append(pd.Index(categories[unseen], dtype=object))
+        # Categorical code -1 (NaN) indexes the trailing -1
+        return np.append(lookup, -1)[column.cat.codes.to_numpy()]
+
+    def encode(self, chunk):
+        """A chunk of log rows as (target, attacker, force, killed) arrays,
+        with players as codes into ``self.players``."""
+        return (
+            self._intern(chunk['Particle']),
+            self._intern(chunk['Opponent']),
+            chunk['Force Received'].to_numpy(dtype=np.float64),
+            chunk['Killed'].to_numpy(dtype=bool),
+        )
+
+    def add(self, chunk):
+        """Fold the next chunk of log rows into the running aggregates."""
+        self.add_codes(*self.encode(chunk))
+
+    def add_codes(self, target, attacker, force, killed):
+        """Fold in log rows already encoded against ``self.players``
+        (see :meth:`encode`; -1 means no opponent)."""
+        target = np.asarray(target, dtype=np.int64)
+        attacker = np.asarray(attacker, dtype=np.int64)
+        force = np.asarray(force, dtype=np.float64)
+        killed = np.asarray(killed, dtype=bool)
+        # Hits with no opponent (e.g. wall collisions) still count as damage received
+        has_attacker = attacker >= 0
+        lethal = killed & has_attacker
+
+        n_players = len(self.players)
+        self.kills = _grow(self.kills, n_players) + np.bincount(attacker[lethal], minlength=n_players)
+        self.deaths = _grow(self.deaths, n_players) + np.bincount(target[killed], minlength=n_players)
+        self.damage_received = _grow(self.damage_received, n_players) + np.bincount(
+            target, weights=force, minlength=n_players)
+        self.damage_dealt = _grow(self.damage_dealt, n_players) + np.bincount(
+            attacker[has_attacker], weights=force[has_attacker], minlength=n_players)
+
+        # Nemesis: the opponent on each player's lethal hit
+        self.nemesis = _grow(self.nemesis, n_players, fill=-1)
+        self.nemesis[target[lethal]] = attacker[lethal]
+
+        # Record first eliminations only; assigning in reverse lets the
+        # earliest row win when a player appears killed twice in one chunk
+        self.death_row = _grow(self.death_row, n_players, fill=-1)
+        dying = target[killed]
+        first_time = self.death_row[dying] < 0
+        self.death_row[dying[first_time][::-1]] = (np.flatnonzero(killed) + self.rows_seen)[first_time][::-1]
+        self.rows_seen += len(target)
+
+        # Per-chunk damage, hits and kills per (attacker, target) pair, merged lazily
+        keys = (attacker[has_attacker] << self.PAIR_SHIFT) | target[has_attacker]
+        keys, index = np.unique(keys, return_inverse=True)
+        self._pending_pairs.append((
+            keys,
+            np.bincount(index, weights=force[has_attacker]),
+            np.bincount(index, minlength=len(keys)),
+            np.bincount(index[lethal[has_attacker]], minlength=len(keys)),
+        ))
+        self._pending_len += len(keys)
+        if self._pending_len > len(self.pair_keys) + CHUNK_ROWS:
+            self._merge_pairs()
+
+    def _merge_pairs(self):
+        """Collapse pending per-chunk pair sums into the running pair totals."""
+        keys, damage, hits, kills = (
+            np.concatenate([running] + [pending[i] for pending in self._pending_pairs])
+            for i, running in enumerate((self.pair_keys, self.pair_damage, self.pair_hits, self.pair_kills))
+        )
+        self.pair_keys, index = np.unique(keys, return_inverse=True)
+        self.pair_damage = np.bincount(index, weights=damage)
+        self.pair_hits = np.bincount(index, weights=hits).astype(np.int64)
+        self.pair_kills = np.bincount(index, weights=kills).astype(np.int64)
+        self._pending_pairs = []
+        self._pending_len = 0
+
+    def edges(self):
+        """Per (attacker, target) totals as a DataFrame of EDGE_COLUMNS."""
+        self._merge_pairs()
+        names = self.players.to_numpy()
+        return pd.DataFrame({
+            'player': names[self.pair_keys >> self.PAIR_SHIFT],
+            'opponent': names[self.pair_keys & ((1 << self.PAIR_SHIFT) - 1)],
+            'hits': self.pair_hits,
+            'damage': self.pair_damage,
+            'killed': (self.pair_kills > 0).astype(np.int64),
+        }, columns=EDGE_COLUMNS)
+
+    def result(self):
+        """Final per-player DataFrame (PLAYER_COLUMNS) and the winner."""
+        self._merge_pairs()
+        n_players = len(self.players)
+
+        names = np.empty(n_players + 1, dtype=object)
+        names[:n_players] = self.players.to_numpy()
+
+        # Victim: the opponent each player dealt the most total damage to.
+        # Damage is compared at float32-safe precision and exact ties (e.g. two
+        # full-HP kills) go to the alphabetically first name, so the result does
+        # not depend on chunking
+        pair_attacker = self.pair_keys >> self.PAIR_SHIFT
+        pair_target = self.pair_keys & ((1 << self.PAIR_SHIFT) - 1)
+        name_order = np.argsort(np.argsort(names[:n_players].astype(str)))
+        best_first = np.lexsort((name_order[pair_target], -np.round(self.pair_damage, 3), pair_attacker))
+        is_best = np.r_[True, pair_attacker[best_first][1:] != pair_attacker[best_first][:-1]]
+        victim = np.full(n_players, -1)
+        victim[pair_attacker[best_first][is_best]] = pair_target[best_first][is_best]
+
+        # Rank: players still alive when someone is eliminated, so the first out
+        # gets n_players and the last one eliminated gets 2; survivors keep 0
+        death_row = _grow(self.death_row, n_players, fill=-1)
+        eliminated = np.flatnonzero(death_row >= 0)
+        elimination_order = eliminated[np.argsort(death_row[eliminated], kind='stable')]
+        rank = np.zeros(n_players, dtype=int)
+        rank[elimination_order] = n_players - np.arange(len(elimination_order))
+
+        # Index -1 picks the trailing None, i.e. "no nemesis" / "no victim"
+        final_stats = pd.DataFrame({
+            'player': names[:-1],
+            'kills': _grow(self.kills, n_players),
+            'deaths': _grow(self.deaths, n_players),
+            'damage_dealt': _grow(self.damage_dealt, n_players),
+            'damage_received': _grow(self.damage_received, n_players),
+            'nemesis': names[_grow(self.nemesis, n_players, fill=-1)],
+            'victim': names[victim],
+            'rank': rank,
+        }, columns=PLAYER_COLUMNS)
+
+        # Winner: the one player never eliminated. A log that ends with
+        # several survivors (e.g. an interrupted simulation) has no winner.
+        survivors = np.flatnonzero(death_row < 0)
+        winner = names[survivors[0]] if len(survivors) == 1 else None
+
+        return final_stats, winner
+
+
+def aggregate_log(df):
+    """Every player_stats/ranking column and the winner for one battle."""
+    aggregator = BattleAggregator()
+    aggregator.add(df)
+    return aggregator.result()
+
+
+def read_log_file(log_path, chunk_rows=CHUNK_ROWS, archive=None):
+    """Stream a collision log in bounded chunks into a BattleAggregator.
+
+    Peak memory is one chunk of narrow-typed rows plus the per-player and
+    per-pair totals, independent of the length of the log. Encoded rows
+    are also appended to ``archive`` (a LogArchiveWriter) if given.
+    """
+    aggregator = BattleAggregator()
+    for chunk in pd.read_csv(log_path, usecols=list(LOG_DTYPES), dtype=LOG_DTYPES, chunksize=chunk_rows):
+        rows = aggregator.encode(chunk)
+        aggregator.add_codes(*rows)
+        if archive is not None:
+            archive.append(*rows)
+    return aggregator
+
+
+def aggregate_log_file(log_path, chunk_rows=CHUNK_ROWS):
+    """Every player_stats/ranking column and the winner for one log file."""
+    return read_log_file(log_path, chunk_rows).result()
+
+
+# ========= LOG ARCHIVE ========= #
+# Each ingested log is also kept as a fixed-width binary array with players
+# interned to int32 codes (13 bytes a row, against ~40 for the CSV):
+#   <log name>.bin    rows of ARCHIVE_DTYPE, memory-mappable with np.memmap
+#   <log name>.json   log name, battle date, row count and the player names
+#                     the codes index; written last, so it marks a complete
+#                     archive
+# --reprocess rebuilds the database from these without parsing any CSV.
+ARCHIVE_DTYPE = np.dtype([
+    ('target', '<i4'),
+    ('attacker', '<i4'),   # -1 when the hit had no opponent
+    ('force', '<f4'),
+    ('killed', '?'),
+])
+
+
+def archive_paths(log_path, archive_dir=ARCHIVE_DIR):
+    """(data, metadata) archive paths for a collision log."""
+    stem = os.path.join(archive_dir, os.path.splitext(os.path.basename(log_path))[0])
+    return stem + ".bin", stem + ".json"
+
+
+class LogArchiveWriter:
+    """Streams one log's encoded rows to a temp file; :meth:`commit` moves
+    it into place and writes the metadata that marks it complete."""
+
+    def __init__(self, log_path, archive_dir=ARCHIVE_DIR):
+        self.log_path = log_path
+        self.data_path, self.meta_path = archive_paths(log_path, archive_dir)
+        os.makedirs(archive_dir, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(dir=archive_dir, suffix=".tmp")
+        self._file = os.fdopen(fd, "wb")
+        self.rows = 0
+
+    def append(self, target, attacker, force, killed):
+        rows = np.empty(len(target), dtype=ARCHIVE_DTYPE)
+        rows['target'] = target
+        rows['attacker'] = attacker
+        rows['force'] = force
+        rows['killed'] = killed
+        self._file.write(rows.tobytes())
+        self.rows += len(rows)
+
+    def commit(self, players):
+        """Finish the archive; ``players`` are the names the codes index."""
+        self._file.close()
+        os.chmod(self._tmp_path, 0o644)
+        os.replace(self._tmp_path, self.data_path)
+        write_json_atomic(self.meta_path, {
+            "log": os.path.basename(self.log_path),
+            "date": log_date(self.log_path),
+            "rows": self.rows,
+            "players": list(players),
+        })
+
+    def discard(self):
+        self._file.close()
+        os.unlink(self._tmp_path)
+
+
+def read_log_archive(meta_path, chunk_rows=CHUNK_ROWS):
+    """Replay an archived log into a BattleAggregator via a memory map.
+
+    Rows are already typed and interned, so this is array slicing and
+    bincounts only; chunking keeps the pair merge as bounded as for CSVs.
+    """
+    with open(meta_path) as f:
+        meta = json.load(f)
+    aggregator = BattleAggregator()
+    aggregator.players = pd.Index(meta["players"], dtype=object)
+    if meta["rows"]:
+        rows = np.memmap(os.path.splitext(meta_path)[0] + ".bin", dtype=ARCHIVE_DTYPE,
+                         mode='r', shape=(meta["rows"],))
+        for start in range(0, len(rows), chunk_rows):
+            part = rows[start:start + chunk_rows]
+            aggregator.add_codes(part['target'], part['attacker'], part['force'], part['killed'])
+    return meta, aggregator
+
+
+def archive_log(log_path, archive_dir=ARCHIVE_DIR, chunk_rows=CHUNK_ROWS):
+    """Write the archive for one collision log without ingesting it."""
+    archive = LogArchiveWriter(log_path, archive_dir)
+    try:
+        aggregator = read_log_file(log_path, chunk_rows, archive)
+    except BaseException:
+        archive.discard()
+        raise
+    archive.commit(aggregator.players)
+
+
+def battle_id(conn, date_str):
+    """The battles id for ``date_str``, added on first use."""
+    conn.execute("INSERT OR IGNORE INTO battles (date) VALUES (?)", (date_str,))
+    return conn.execute("SELECT battle_id FROM battles WHERE date = ?", (date_str,)).fetchone()[0]
+
+
+def player_ids(conn, names):
+    """{name: player_id} for ``names`` (missing values skipped), adding new players.
+
+    The lookup binds every name as one JSON array, so it is a single
+    statement however many players the battle had.
+    """
+    names = [name for name in dict.fromkeys(names) if not pd.isna(name)]
+    conn.executemany("INSERT OR IGNORE INTO players (player) VALUES (?)", ((name,) for name in names))
+    return dict(conn.execute("""
+        SELECT p.player, p.player_id
+        FROM json_each(?) AS j
+        JOIN players p ON p.player = j.value
+    """, (json.dumps(names),)))
+
+
+def write_player_stats(conn, date_str, final_stats):
+    """Bulk-insert one battle's player_stats and ranking rows.
+
+    Rows are zipped from whole-column lists rather than built per DataFrame
+    row, and each table gets a single executemany call; ``tolist()`` also
+    converts NumPy scalars to the Python types sqlite3 binds natively. The
+    caller owns the transaction.
+    """
+    battle = battle_id(conn, date_str)
+    # Nemeses and victims are fighters of the same battle, so have a row too
+    names = final_stats['player'].tolist()
+    ids = player_ids(conn, names)
+    players = [ids[name] for name in names]
+    rows = zip(
+        itertools.repeat(battle),
+        players,
+        final_stats['kills'].astype(int).tolist(),
+        final_stats['deaths'].astype(int).tolist(),
+        final_stats['damage_dealt'].astype(float).tolist(),
+        final_stats['damage_received'].astype(float).tolist(),
+        [ids.get(name) for name in final_stats['nemesis'].tolist()],
+        [ids.get(name) for name in final_stats['victim'].tolist()],
+    )
+    conn.executemany("""
+        INSERT OR REPLACE INTO player_stats
+        (battle_id, player_id, kills, deaths, damage_dealt, damage_received, nemesis_id, victim_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, rows)
+
+    conn.executemany("""
+        INSERT OR REPLACE INTO ranking (battle_id, player_id, rank) VALUES (?, ?, ?)
+    """, zip(itertools.repeat(battle), players, final_stats['rank'].astype(int).tolist()))
+
+
+def write_head_to_head(conn, date_str, edges, replace=False):
+    """Bulk-insert one battle's head_to_head edges.
+
+    With ``replace``, the battle's old edges are deleted first, so a
+    re-ingested log leaves no pairs that no longer occur. The caller owns
+    the transaction.
+    """
+    battle = battle_id(conn, date_str)
+    if replace:
+        conn.execute("DELETE FROM head_to_head WHERE battle_id = ?", (battle,))
+    ids = player_ids(conn, itertools.chain(edges['player'].tolist(), edges['opponent'].tolist()))
+    conn.executemany("""
+        INSERT OR REPLACE INTO head_to_head (player_id, opponent_id, battle_id, hits, damage, killed)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, zip(
+        edges['player'].map(ids).tolist(),
+        edges['opponent'].map(ids).tolist(),
+        itertools.repeat(battle),
+        edges['hits'].tolist(),
+        edges['damage'].tolist(),
+        edges['killed'].tolist(),
+    ))
+
+
+def add_battle_to_totals(conn, final_stats):
+    """Fold one newly ingested battle into player_totals.
+
+    Cost is proportional to the battle's players, not to all history. The
+    caller owns the transaction.
+    """
+    ids = player_ids(conn, final_stats['player'].tolist())
+    rank = final_stats['rank'].astype(int)
+    rows = zip(
+        final_stats['player'].map(ids).tolist(),
+        final_stats['kills'].astype(int).tolist(),
+        final_stats['deaths'].astype(int).tolist(),
+        final_stats['damage_dealt'].astype(float).tolist(),
+        final_stats['damage_received'].astype(float).tolist(),
+        rank.tolist(),
+        (rank == 0).astype(int).tolist(),
+    )
+    conn.executemany("""
+        INSERT INTO player_totals
+        (player_id, battles, kills, deaths, damage_dealt, damage_received,
+         best_kills, best_damage, best_rank, wins)
+        VALUES (?1, 1, ?2, ?3, ?4, ?5, ?2, ?4, ?6, ?7)
+        ON CONFLICT (player_id) DO UPDATE SET
+            battles = battles + 1,
+            kills = kills + excluded.kills,
+            deaths = deaths + excluded.deaths,
+            damage_dealt = damage_dealt + excluded.damage_dealt,
+            damage_received = damage_received + excluded.damage_received,
+            best_kills = MAX(best_kills, excluded.best_kills),
+            best_damage = MAX(best_damage, excluded.best_damage),
+            best_rank = MIN(COALESCE(best_rank, excluded.best_rank), excluded.best_rank),
+            wins = wins + excluded.wins
+    """, rows)
+
+
+def refresh_player_totals(conn, date_str=None):
+    """Recompute player_totals from player_stats/ranking.
+
+    With ``date_str``, only the players of that battle are recomputed (used
+    when a battle is re-ingested, where adding would double count);
+    otherwise the whole table is rebuilt. The caller owns the transaction.
+    """
+    where = ""
+    params = ()
+    if date_str is None:
+        conn.execute("DELETE FROM player_totals")
+    else:
+        where = """WHERE ps.player_id IN (
+            SELECT player_id FROM player_stats
+            WHERE battle_id = (SELECT battle_id FROM battles WHERE date = ?))"""
+        params = (date_str,)
+    conn.execute(f"""
+        INSERT OR REPLACE INTO player_totals
+        (player_id, battles, kills, deaths, damage_dealt, damage_received,
+         best_kills, best_damage, best_rank, wins)
+        SELECT ps.player_id, COUNT(*), SUM(ps.kills), SUM(ps.deaths),
+               SUM(ps.damage_dealt), SUM(ps.damage_received),
+               MAX(ps.kills), MAX(ps.damage_dealt), MIN(r.rank), COALESCE(SUM(r.rank = 0), 0)
+        FROM player_stats ps
+        LEFT JOIN ranking r ON r.battle_id = ps.battle_id AND r.player_id = ps.player_id
+        {where}
+        GROUP BY ps.player_id
+    """, params)
+
+
+def refresh_percentiles(conn, date_str=None):
+    """Recompute player_percentiles for one battle, or for every battle.
+
+    CUME_DIST over the battle, best first, is the share of the field that
+    did at least as well, ties included: the winner's rank_pct is 100/N.
+    The caller owns the transaction.
+    """
+    where = ""
+    params = ()
+    if date_str is not None:
+        where = "WHERE ps.battle_id = (SELECT battle_id FROM battles WHERE date = ?)"
+        params = (date_str,)
+    conn.execute(f"""
+        INSERT OR REPLACE INTO player_percentiles
+        (battle_id, player_id, kills_pct, damage_pct, rank_pct)
+        SELECT ps.battle_id, ps.player_id,
+               100.0 * CUME_DIST() OVER (PARTITION BY ps.battle_id ORDER BY ps.kills DESC),
+               100.0 * CUME_DIST() OVER (PARTITION BY ps.battle_id ORDER BY ps.damage_dealt DESC),
+               100.0 * CUME_DIST() OVER (PARTITION BY ps.battle_id ORDER BY r.rank IS NULL, r.rank)
+        FROM player_stats ps
+        LEFT JOIN ranking r ON r.battle_id = ps.battle_id AND r.player_id = ps.player_id
+        {where}
+    """, params)
+
+
+def refresh_all_time_stats(conn):
+    """Rewrite the all_time_stats snapshot row in one statement.
+
+    Every highlight is an index-ordered LIMIT 1 lookup or a covering-index
+    sum over player_totals, so this costs O(players) rather than
+    O(player_stats rows). The caller owns the transaction.
+    """
+    conn.execute("""
+        WITH
+            span AS (SELECT COUNT(*) AS n, MIN(date) AS first, MAX(date) AS last FROM daily_summary),
+            totals AS (SELECT COUNT(*) AS players, SUM(kills) AS kills, SUM(damage_dealt) AS damage
+                       FROM player_totals),
+            top_winner AS (SELECT winner, COUNT(*) AS wins FROM daily_summary
+                           GROUP BY winner ORDER BY wins DESC LIMIT 1),
+            top_killer AS (SELECT player_id, kills FROM player_totals ORDER BY kills DESC LIMIT 1),
+            top_damage AS (SELECT player_id, damage_dealt FROM player_totals ORDER BY damage_dealt DESC LIMIT 1),
+            top_kdr AS (SELECT player_id, kills, kdr FROM player_totals WHERE kills > 0
+                        ORDER BY kdr DESC LIMIT 1),
+            most_active AS (SELECT player_id, battles FROM player_totals ORDER BY battles DESC LIMIT 1),
+            highest_kills AS (SELECT player_id, kills, battle_id FROM player_stats ORDER BY kills DESC LIMIT 1),
+            highest_damage AS (SELECT player_id, damage_dealt, battle_id FROM player_stats
+                               ORDER BY damage_dealt DESC LIMIT 1),
+            busiest_day AS (SELECT date, COUNT(*) AS n FROM daily_summary GROUP BY date ORDER BY n DESC LIMIT 1)
+        INSERT OR REPLACE INTO all_time_stats
+        SELECT 1, b.n, t.players, COALESCE(b.first, 'N/A'), COALESCE(b.last, 'N/A'),
+               tw.winner, COALESCE(tw.wins, 0),
+               COALESCE(t.kills, 0), COALESCE(t.damage, 0),
+               (SELECT player FROM players WHERE player_id = tk.player_id), COALESCE(tk.kills, 0),
+               (SELECT player FROM players WHERE player_id = td.player_id), COALESCE(td.damage_dealt, 0),
+               (SELECT player FROM players WHERE player_id = kd.player_id),
+               COALESCE(ROUND(kd.kdr, 2), 0), COALESCE(kd.kills, 0),
+               (SELECT player FROM players WHERE player_id = ma.player_id), COALESCE(ma.battles, 0),
+               (SELECT player FROM players WHERE player_id = hk.player_id), COALESCE(hk.kills, 0),
+               (SELECT date FROM battles WHERE battle_id = hk.battle_id),
+               (SELECT player FROM players WHERE player_id = hd.player_id), COALESCE(hd.damage_dealt, 0),
+               (SELECT date FROM battles WHERE battle_id = hd.battle_id),
+               bd.date, COALESCE(bd.n, 0)
+        FROM span b
+        CROSS JOIN totals t
+        LEFT JOIN top_winner tw ON 1
+        LEFT JOIN top_killer tk ON 1
+        LEFT JOIN top_damage td ON 1
+        LEFT JOIN top_kdr kd ON 1
+        LEFT JOIN most_active ma ON 1
+        LEFT JOIN highest_kills hk ON 1
+        LEFT JOIN highest_damage hd ON 1
+        LEFT JOIN busiest_day bd ON 1
+    """)
+
+
+def bump_data_version(conn):
+    """Advance the data version read by the dashboard's caches.
+
+    Call inside the writing transaction, so readers never see new data
+    under an old version. The caller owns the transaction.
+    """
+    conn.execute("""
+        INSERT INTO meta (key, value) VALUES ('data_version', 1)
+        ON CONFLICT (key) DO UPDATE SET value = value + 1
+    """)
+
+
+class NoWinnerError(ValueError):
+    """A battle ended with several fighters still standing, e.g. because
+    the simulation was interrupted, so it has no ranking to store."""
+
+
+def write_battle(conn, date_str, final_stats, winner, edges, replace=False):
+    """Write one battle's player rows, edges, percentiles and summary.
+
+    ``replace`` drops the battle's old edges first. player_totals and the
+    all-time snapshot are left to the caller, as is the transaction.
+    Raises NoWinnerError, before writing anything, if there is no winner:
+    every survivor would otherwise be stored with rank 0 and credited
+    with a win.
+    """
+    if not winner:
+        survivors = int((final_stats['rank'] == 0).sum())
+        raise NoWinnerError(f"battle of {date_str} ends with {survivors} survivors and no winner")
+
+    write_player_stats(conn, date_str, final_stats)
+    write_head_to_head(conn, date_str, edges, replace=replace)
+    refresh_percentiles(conn, date_str)
+
+    # Update daily summary
+    conn.execute("""
+        INSERT OR REPLACE INTO daily_summary
+        (date, num_players, winner)
+        VALUES (?, ?, ?)
+    """, (date_str, len(final_stats), winner))
+
+
+def ingest_aggregate(conn, log_path, aggregator, live=None):
+    """Write one fully aggregated battle and fold it into the totals, in
+    one transaction.
+
+    ``live`` (a LiveStandings) is emptied in the same transaction, so the
+    dashboard goes straight from the live standings to the stored battle.
+    A battle with no winner raises NoWinnerError and writes nothing.
+    """
+    date_str = log_date(log_path)
+    final_stats, winner = aggregator.result()
+    edges = aggregator.edges()
+
+    # `with conn` commits on success and rolls back on any error
+    with conn:
+        reingest = conn.execute("""
+            SELECT 1 FROM player_stats
+            WHERE battle_id = (SELECT battle_id FROM battles WHERE date = ?)
+            LIMIT 1
+        """, (date_str,)).fetchone() is not None
+        write_battle(conn, date_str, final_stats, winner, edges, replace=reingest)
+        if reingest:
+            refresh_player_totals(conn, date_str)
+        else:
+            add_battle_to_totals(conn, final_stats)
+        refresh_all_time_stats(conn)
+        if live is not None:
+            live.clear()
+        bump_data_version(conn)
+
+    return {"date": date_str, "num_players": len(final_stats), "winner": winner}
+
+
+def ingest_log(conn, log_path, chunk_rows=CHUNK_ROWS, archive_dir=ARCHIVE_DIR):
+    """Aggregate one collision log and write it to the database in one transaction.
+
+    The log is archived to ``archive_dir`` (None to skip) as it is read;
+    the archive is only kept if the transaction commits.
+    """
+    archive = LogArchiveWriter(log_path, archive_dir) if archive_dir else None
+    try:
+        aggregator = read_log_file(log_path, chunk_rows, archive)
+        result = ingest_aggregate(conn, log_path, aggregator)
+    except BaseException:
+        if archive is not None:
+            archive.discard()
+        raise
+    if archive is not None:
+        archive.commit(aggregator.players)
+    return result
+
+
+# ========= SNAPSHOT EXPORT ========= #
+# Pre-shaped JSON copies of everything the dashboard shows, for running it
+# with ICON_CLASH_DATA_SOURCE=snapshots and no SQLite access per request:
+#   index.json              data version, dates, all-time stats, winners,
+#                           leaderboards and the fighter list
+#   battles/<date>.json     one battle's summary, player stats and top lists
+#   fighters/<hash>.json    one fighter's totals and per-battle history
+# The payloads are built by dashboard_queries, the same functions the
+# dashboard calls on its SQLite connections.
+
+
+def battle_snapshot(conn, date_str):
+    """One battle's dashboard payload."""
+    return dashboard_queries.battle(conn, date_str)
+
+
+def fighter_snapshot(conn, player):
+    """One fighter's all-time totals, battle history (newest first) and
+    top rivals."""
+    return {
+        "totals": dashboard_queries.fighter_totals(conn, player),
+        "history": dashboard_queries.fighter_history(conn, player),
+        "rivals": dashboard_queries.rivalries(conn, player),
+    }
+
+
+def index_snapshot(conn):
+    """Everything that is not per battle or per fighter."""
+    return {
+        "data_version": dashboard_queries.data_version(conn),
+        "dates": dashboard_queries.available_dates(conn),
+        "all_time_stats": dashboard_queries.all_time_stats(conn),
+        "daily_winners": dashboard_queries.daily_winners(conn),
+        "leaderboards": {
+            stat: dashboard_queries.all_time_leaderboard(conn, stat)
+            for stat in dashboard_queries.LEADERBOARD_STATS
+        },
+        "players": dashboard_queries.all_players(conn),
+    }
+
+
+def export_snapshots(conn, out_dir=SNAPSHOT_DIR, dates=None):
+    """Write dashboard snapshots for ``dates`` (every battle if None).
+
+    Only the battles given and the fighters who fought in them are
+    rewritten; index.json goes last, so a reader that sees its new data
+    version also sees every file it refers to. Reads run in one
+    transaction, so all files reflect the same committed state.
+    """
+    with conn:
+        conn.execute("BEGIN")
+        if dates is None:
+            dates = [r[0] for r in conn.execute("""
+                SELECT date FROM battles b
+                WHERE EXISTS (SELECT 1 FROM player_stats WHERE battle_id = b.battle_id)
+            """)]
+            players = [r[0] for r in conn.execute("""
+                SELECT p.player FROM player_totals t JOIN players p ON p.player_id = t.player_id
+            """)]
+        else:
+            players = sorted({
+                r[0] for date_str in dates
+                for r in conn.execute("""
+                    SELECT p.player FROM battles b
+                    JOIN player_stats ps ON ps.battle_id = b.battle_id
+                    JOIN players p ON p.player_id = ps.player_id
+                    WHERE b.date = ?
+                """, (date_str,))
+            })
+
+        for date_str in dates:
+            write_json_atomic(os.path.join(out_dir, "battles", f"{date_str}.json"),
+                              battle_snapshot(conn, date_str))
+        for player in players:
+            write_json_atomic(os.path.join(out_dir, "fighters", dashboard_queries.fighter_snapshot_name(player)),
+                              fighter_snapshot(conn, player))
+        write_json_atomic(os.path.join(out_dir, "index.json"), index_snapshot(conn))
+
+    print(f"🗂️ Exported snapshots for {len(dates)} battles and {len(players)} fighters to {out_dir}/")
+
+
+def export_all(db_path=DB_PATH, out_dir=SNAPSHOT_DIR):
+    """Write a complete snapshot set for the database."""
+    conn = sqlite3.connect(db_path)
+    try:
+        ensure_schema(conn)
+        export_snapshots(conn, out_dir)
+    finally:
+        conn.close()
+
+
+# ========= REBUILD ========= #
+def aggregate_source(source, chunk_rows=CHUNK_ROWS, archive_dir=None):
+    """Aggregate one battle from a log CSV or an archive's .json metadata.
+
+    Runs in the rebuild's worker processes, so it touches no database and
+    returns only picklable results: (date, final_stats, winner, edges).
+    A CSV without an archive is archived to ``archive_dir`` on the way.
+    """
+    archive = None
+    if source.endswith(".json"):
+        meta, aggregator = read_log_archive(source, chunk_rows)
+        date_str = meta["date"]
+    else:
+        date_str = log_date(source)
+        if archive_dir and not os.path.exists(archive_paths(source, archive_dir)[1]):
+            archive = LogArchiveWriter(source, archive_dir)
+        try:
+            aggregator = read_log_file(source, chunk_rows, archive)
+        except BaseException:
+            if archive is not None:
+                archive.discard()
+            raise
+    final_stats, winner = aggregator.result()
+    if archive is not None:
+        # A log with no winner is skipped, and its archive would be
+        # replayed in place of the log once the battle is complete
+        if winner is None:
+            archive.discard()
+        else:
+            archive.commit(aggregator.players)
+    return date_str, final_stats, winner, aggregator.edges()
+
+
+def map_in_order(func, items, workers):
+    """Yield ``func(item)`` for each item, in order, computing up to
+    2 * workers results ahead in a process pool (inline if workers <= 1).
+
+    The window bounds how many finished battles wait in memory when the
+    consumer is slower than the pool.
+    """
+    if workers <= 1:
+        yield from map(func, items)
+        return
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = collections.deque()
+        for item in items:
+            pending.append(pool.submit(func, item))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def rebuild_sources(log_dir=SIMULATIONS_DIR, archive_dir=ARCHIVE_DIR):
+    """Every battle that can be recomputed, oldest first: its archive if
+    there is one (cheaper to replay), else its log CSV. Either directory
+    may be None to leave that kind of source out."""
+    sources = {}
+    if log_dir:
+        sources.update(
+            (os.path.splitext(os.path.basename(path))[0], path)
+            for path in glob.glob(os.path.join(log_dir, f"*{LOG_SUFFIX}"))
+        )
+    if archive_dir:
+        sources.update(
+            (os.path.splitext(os.path.basename(path))[0], path)
+            for path in glob.glob(os.path.join(archive_dir, "*.json"))
+        )
+    # Log names start with YYYYMMDD_HHMMSS, so name order is battle order
+    return [sources[name] for name in sorted(sources)]
+
+
+def source_log_name(source):
+    """The manifest entry of a rebuild source: the log's own file name, or
+    for an archive the name of the log it was made from."""
+    name = os.path.basename(source)
+    if name.endswith(".json"):
+        return os.path.splitext(name)[0] + ".csv"
+    return name
+
+
+def rebuild_database(sources, db_path=DB_PATH, workers=None, chunk_rows=CHUNK_ROWS,
+                     archive_dir=ARCHIVE_DIR, snapshot_dir=SNAPSHOT_DIR, manifest_path=MANIFEST_PATH):
+    """Recompute the battles in ``sources`` (see rebuild_sources).
+
+    Logs are parsed and aggregated in a pool of ``workers`` processes
+    (default: one per core); this process is the only writer and applies
+    the battles in date order. player_stats, ranking, head_to_head,
+    percentiles and summary of each battle are rewritten in a transaction
+    of their own, which keeps every commit (and the WAL it leaves to
+    checkpoint) bounded by one battle however long the history; then
+    player_totals and the all-time snapshot are rebuilt in a final one, so
+    until it commits those lag the battles already rewritten. Battles with
+    no log or archive, or whose log ends with no winner, are left as they
+    are. An existing snapshot export is rewritten.
+
+    The manifest follows each battle's commit: a rebuilt log is listed, a
+    log with no winner is dropped so the next ingest tries it again, and
+    entries for logs that were not among ``sources`` are kept.
+    """
+    if not sources:
+        print("No collision logs or log archives to rebuild from")
+        return []
+    workers = min(workers or os.cpu_count() or 1, len(sources))
+    aggregate = functools.partial(aggregate_source, chunk_rows=chunk_rows, archive_dir=archive_dir)
+
+    processed = load_manifest(manifest_path)
+    conn = connect_for_load(db_path)
+    results = []
+    try:
+        ensure_schema(conn)
+        battles = zip(sources, map_in_order(aggregate, sources, workers))
+        for source, (date_str, final_stats, winner, edges) in battles:
+            try:
+                with conn:
+                    write_battle(conn, date_str, final_stats, winner, edges, replace=True)
+                    bump_data_version(conn)
+            except NoWinnerError as e:
+                print(f"⚠️ Skipped: {e}; stored battle left as it is")
+                processed.discard(source_log_name(source))
+                save_manifest(processed, manifest_path)
+                continue
+            processed.add(source_log_name(source))
+            save_manifest(processed, manifest_path)
+            results.append({"date": date_str, "num_players": len(final_stats), "winner": winner})
+            print(f"✅ Rebuilt {date_str}: {len(final_stats)} players, winner {winner}")
+        with conn:
+            refresh_player_totals(conn)
+            refresh_all_time_stats(conn)
+            bump_data_version(conn)
+        if os.path.exists(os.path.join(snapshot_dir, "index.json")):
+            export_snapshots(conn, snapshot_dir)
+        conn.execute("PRAGMA optimize")
+        checkpoint_wal(conn)
+    finally:
+        conn.close()
+
+    print(f"♻️ Rebuilt {len(results)} battles with {workers} worker processes")
+    return results
+
+
+def reprocess_archives(db_path=DB_PATH, archive_dir=ARCHIVE_DIR, chunk_rows=CHUNK_ROWS,
+                       snapshot_dir=SNAPSHOT_DIR, workers=None, manifest_path=MANIFEST_PATH):
+    """Recompute every archived battle from its memory-mapped archive.
+
+    For after a change to how stats are derived; see rebuild_database.
+    """
+    return rebuild_database(rebuild_sources(None, archive_dir), db_path, workers, chunk_rows,
+                            archive_dir, snapshot_dir, manifest_path)
+
+
+def archive_unarchived_logs(log_dir=SIMULATIONS_DIR, archive_dir=ARCHIVE_DIR, chunk_rows=CHUNK_ROWS):
+    """Archive every collision log in ``log_dir`` that has no archive yet."""
+    log_paths = sorted(glob.glob(os.path.join(log_dir, f"*{LOG_SUFFIX}")), key=os.path.basename)
+    archived = 0
+    for log_path in log_paths:
+        if os.path.exists(archive_paths(log_path, archive_dir)[1]):
+            continue
+        archive_log(log_path, archive_dir, chunk_rows)
+        archived += 1
+    print(f"🗄️ Archived {archived} logs to {archive_dir}/")
+    return archived
+
+
+# ========= LIVE FOLLOW ========= #
+# --follow tails a collision log while the simulation is still writing it.
+# Only the bytes appended since the last read are parsed, running standings
+# go to live_battle/live_stats in one small transaction per read, and once
+# the log stops growing the battle is ingested from the same aggregates.
+FOLLOW_POLL_SECONDS = 1.0
+FOLLOW_IDLE_SECONDS = 60.0
+# Most bytes parsed per read, so catching up on a long log stays bounded
+FOLLOW_READ_BYTES = 32 * 2**20
+
+
+class LogTail:
+    """The complete rows appended to a growing collision log since the
+    last read, found by byte offset; a trailing partial line is left for
+    the next read."""
+
+    def __init__(self, path, read_bytes=FOLLOW_READ_BYTES):
+        self.path = path
+        self.read_bytes = read_bytes
+        self.offset = 0
+        self.header = None
+
+    def read(self):
+        """New rows as a DataFrame of LOG_DTYPES columns, or None."""
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(self.read_bytes)
+        data = data[:data.rfind(b"\n") + 1]
+        if self.header is None and data:
+            split = data.index(b"\n") + 1
+            self.header, data = data[:split], data[split:]
+            self.offset += split
+        if not data:
+            return None
+        self.offset += len(data)
+        return pd.read_csv(io.BytesIO(self.header + data), usecols=list(LOG_DTYPES), dtype=LOG_DTYPES)
+
+
+class LiveStandings:
+    """Publishes a followed battle's running totals to live_battle/live_stats.
+
+    Each :meth:`publish` rewrites only the fighters whose kills, deaths,
+    damage or survival changed since the previous one, and bumps
+    meta.live_version for the dashboard's Live view.
+    """
+
+    def __init__(self, conn, log_path):
+        self.conn = conn
+        self.log_path = log_path
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.published = np.zeros((0, 5))
+
+    def publish(self, aggregator):
+        """Write the changes in ``aggregator`` since the last publish, in
+        one transaction; returns how many fighters changed."""
+        n_players = len(aggregator.players)
+        current = np.column_stack((
+            _grow(aggregator.kills, n_players),
+            _grow(aggregator.deaths, n_players),
+            _grow(aggregator.damage_dealt, n_players),
+            _grow(aggregator.damage_received, n_players),
+            _grow(aggregator.death_row, n_players, fill=-1) < 0,
+        ))
+        previous = np.full_like(current, np.nan)
+        previous[:len(self.published)] = self.published
+        changed = np.flatnonzero((current != previous).any(axis=1))
+
+        with self.conn:
+            if n_players > len(self.ids):
+                names = aggregator.players[len(self.ids):].tolist()
+                ids = player_ids(self.conn, names)
+                self.ids = np.append(self.ids, [ids[name] for name in names])
+            rows = current[changed]
+            self.conn.executemany("""
+                INSERT OR REPLACE INTO live_stats
+                (player_id, kills, deaths, damage_dealt, damage_received, alive)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, zip(
+                self.ids[changed].tolist(),
+                rows[:, 0].astype(int).tolist(),
+                rows[:, 1].astype(int).tolist(),
+                rows[:, 2].tolist(),
+                rows[:, 3].tolist(),
+                rows[:, 4].astype(int).tolist(),
+            ))
+            self.conn.execute("""
+                INSERT OR REPLACE INTO live_battle (id, date, log, rows, players, survivors, updated)
+                VALUES (1, ?, ?, ?, ?, ?, ?)
+            """, (log_date(self.log_path), os.path.basename(self.log_path), aggregator.rows_seen,
+                  n_players, int(current[:, 4].sum()), time.time()))
+            bump_live_version(self.conn)
+        self.published = current
+        return len(changed)
+
+    def clear(self):
+        """Empty the live tables. The caller owns the transaction."""
+        self.conn.execute("DELETE FROM live_stats")
+        self.conn.execute("DELETE FROM live_battle")
+        bump_live_version(self.conn)
+
+
+def bump_live_version(conn):
+    """Advance the version the dashboard's Live view polls; kept apart
+    from data_version so live updates do not invalidate every other
+    cached page. The caller owns the transaction."""
+    conn.execute("""
+        INSERT INTO meta (key, value) VALUES ('live_version', 1)
+        ON CONFLICT (key) DO UPDATE SET value = value + 1
+    """)
+
+
+def newest_log(log_dir=SIMULATIONS_DIR):
+    """The most recent collision log in ``log_dir``, or None."""
+    log_files = glob.glob(os.path.join(log_dir, f"*{LOG_SUFFIX}"))
+    return max(log_files, key=os.path.basename) if log_files else None
+
+
+def follow_log(log_path, db_path=DB_PATH, manifest_path=MANIFEST_PATH, idle_seconds=FOLLOW_IDLE_SECONDS,
+               snapshot_dir=SNAPSHOT_DIR, archive_dir=ARCHIVE_DIR, poll_seconds=FOLLOW_POLL_SECONDS):
+    """Follow a collision log while it is written, then ingest it.
+
+    Appended rows are folded into one BattleAggregator (and the log
+    archive) and published as live standings after every read that finds
+    any. Once the log has not grown for ``idle_seconds`` the battle is
+    ingested from those aggregates, without a second pass over the CSV,
+    and recorded in the manifest; if it ends with no winner (see
+    NoWinnerError) nothing is ingested. Ctrl-C stops following and clears
+    the live standings without ingesting anything.
+    """
+    conn = connect_for_load(db_path)
+    archive = LogArchiveWriter(log_path, archive_dir) if archive_dir else None
+    tail = LogTail(log_path)
+    aggregator = BattleAggregator()
+    live = LiveStandings(conn, log_path)
+    try:
+        ensure_schema(conn)
+        with conn:
+            live.clear()
+        print(f"👀 Following {log_path}; ingesting once it is idle for {idle_seconds:g}s (Ctrl-C to stop)")
+
+        last_growth = time.monotonic()
+        while time.monotonic() - last_growth < idle_seconds:
+            chunk = tail.read()
+            if chunk is None:
+                time.sleep(poll_seconds)
+                continue
+            rows = aggregator.encode(chunk)
+            aggregator.add_codes(*rows)
+            if archive is not None:
+                archive.append(*rows)
+            changed = live.publish(aggregator)
+            print(f"📡 {aggregator.rows_seen:,} events, {len(aggregator.players):,} fighters, "
+                  f"{changed:,} updated")
+            last_growth = time.monotonic()
+
+        result = ingest_aggregate(conn, log_path, aggregator, live)
+    except NoWinnerError as e:
+        if archive is not None:
+            archive.discard()
+        with conn:
+            live.clear()
+        conn.close()
+        print(f"❌ Not ingesting {log_path}: {e}")
+        return None
+    except KeyboardInterrupt:
+        if archive is not None:
+            archive.discard()
+        with conn:
+            live.clear()
+        conn.close()
+        print(f"⏹️ Stopped following {log_path}; nothing ingested")
+        return None
+    except BaseException:
+        if archive is not None:
+            archive.discard()
+        conn.close()
+        raise
+
+    try:
+        if archive is not None:
+            archive.commit(aggregator.players)
+        processed = load_manifest(manifest_path)
+        processed.add(os.path.basename(log_path))
+        save_manifest(processed, manifest_path)
+        if os.path.exists(os.path.join(snapshot_dir, "index.json")):
+            export_snapshots(conn, snapshot_dir, [result["date"]])
+        conn.execute("PRAGMA optimize")
+        checkpoint_wal(conn)
+    finally:
+        conn.close()
+
+    print(f"✅ Database updated successfully for date: {result['date']}")
+    print(f"📊 Processed {result['num_players']} players")
+    print(f"🏆 Winner: {result['winner']}")
+    return result
+
+
+def process_simulation_logs(log_dir=SIMULATIONS_DIR, db_path=DB_PATH, manifest_path=MANIFEST_PATH,
+                            chunk_rows=CHUNK_ROWS, snapshot_dir=SNAPSHOT_DIR, archive_dir=ARCHIVE_DIR):
+    """Ingest every unprocessed simulation log and record it in the manifest.
+
+    Each log is archived to ``archive_dir`` as it is ingested. A log with
+    no winner is reported and left out of the manifest, so it is tried
+    again once the simulation has finished writing it. If
+    ``snapshot_dir`` already holds an export (see --export), the snapshots
+    of the new battles and their fighters are refreshed too.
+    """
+
+    pending = find_unprocessed_logs(log_dir, manifest_path)
+    if not pending:
+        print(f"No new collision logs found in {log_dir}/ directory")
+        return []
+
+    processed = load_manifest(manifest_path)
+    results = []
+
     # Connect to database
-    conn = sqlite3.connect('data/daily_stats.db')
-    
+    conn = connect_for_load(db_path)
+
     try:
-        # Process the data and update database
-        # This is a simplified version - you may need to adapt based on your database schema
-        
-        # Get unique players and their stats
-        player_stats = df.groupby('Particle').agg({
-            'Force Received': 'sum',
-            'Killed': 'sum'
-        }).reset_index()
-        
-        # Calculate kills (when opponent was killed)
-        kills_df = df[df['Killed'] == True].groupby('Opponent').size().reset_index(name='kills')
-        kills_df.columns = ['player', 'kills']
-        
-        # Merge with player stats
-        final_stats = player_stats.merge(kills_df, left_on='Particle', right_on='player', how='left')
-        final_stats['kills'] = final_stats['kills'].fillna(0)
-        final_stats['deaths'] = final_stats['Killed']
-        
-        # Insert into database (adjust table names and columns as needed)
-        for _, row in final_stats.iterrows():
-            conn.execute("""
-                INSERT OR REPLACE INTO player_stats 
-                (date, player, kills, deaths, damage_received) 
-                VALUES (?, ?, ?, ?, ?)
-            """, (date_str, row['Particle'], int(row['kills']), int(row['deaths']), row['Force Received']))
-        
-        # Find the winner (last player alive)
-        last_entries = df.tail(10)  # Check last few entries
-        winner = None
-        for _, row in last_entries.iterrows():
-            if not row['Killed']:
-                winner = row['Particle']
-                break
-        
-        if winner:
-            # Update daily summary
-            conn.execute("""
-                INSERT OR REPLACE INTO daily_summary 
-                (date, num_players, winner) 
-                VALUES (?, ?, ?)
-            """, (date_str, len(final_stats), winner))
-        
-        conn.commit()
-        print(f"✅ Database updated successfully for date: {date_str}")
-        print(f"📊 Processed {len(final_stats)} players")
-        print(f"🏆 Winner: {winner}")
-        
-    except Exception as e:
-        print(f"❌ Error updating database: {e}")
-        conn.rollback()
+        ensure_schema(conn)
+
+        for log_path in pending:
+            print(f"Processing: {log_path}")
+            try:
+                result = ingest_log(conn, log_path, chunk_rows, archive_dir)
+            except Exception as e:
+                print(f"❌ Error updating database from {log_path}: {e}")
+                continue
+
+            # Record each log as soon as its transaction commits so an
+            # interrupted backfill resumes where it stopped
+            processed.add(os.path.basename(log_path))
+            save_manifest(processed, manifest_path)
+            results.append(result)
+
+            print(f"✅ Database updated successfully for date: {result['date']}")
+            print(f"📊 Processed {result['num_players']} players")
+            print(f"🏆 Winner: {result['winner']}")
+
+        if results and os.path.exists(os.path.join(snapshot_dir, "index.json")):
+            export_snapshots(conn, snapshot_dir, sorted({result["date"] for result in results}))
+
+        conn.execute("PRAGMA optimize")
+        checkpoint_wal(conn)
     finally:
         conn.close()
 
+    print(f"📦 Ingested {len(results)} of {len(pending)} new logs")
+    return results
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest new collision logs into the dashboard database.")
+    parser.add_argument("--log-dir", default=SIMULATIONS_DIR, help="directory holding *_collision_log.csv files")
+    parser.add_argument("--db", default=DB_PATH, help="SQLite database to update")
+    parser.add_argument("--manifest", default=MANIFEST_PATH, help="JSON list of already-processed log filenames")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS,
+                        help="log rows read per chunk; bounds peak memory for very large logs")
+    parser.add_argument("--migrate", action="store_true",
+                        help="only upgrade the database schema (tables and indexes), ingest nothing")
+    parser.add_argument("--snapshot-dir", default=SNAPSHOT_DIR,
+                        help="JSON snapshots for the dashboard's snapshot mode; refreshed on ingest once exported")
+    parser.add_argument("--export", action="store_true",
+                        help="only (re)write every snapshot in --snapshot-dir from the database, ingest nothing")
+    parser.add_argument("--archive-dir", default=ARCHIVE_DIR,
+                        help="where each ingested log is kept as a compact binary archive")
+    parser.add_argument("--archive", action="store_true",
+                        help="only archive logs in --log-dir that have no archive yet, ingest nothing")
+    parser.add_argument("--reprocess", action="store_true",
+                        help="recompute every archived battle from --archive-dir and rebuild the totals")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="recompute every battle with a log in --log-dir or an archive, and rebuild the totals")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processes parsing logs for --rebuild/--reprocess (default: one per core)")
+    parser.add_argument("--follow", nargs="?", const="", metavar="LOG",
+                        help="tail LOG (default: the newest log in --log-dir) while the simulation writes it, "
+                             "publishing live standings, and ingest it once it stops growing")
+    parser.add_argument("--idle-seconds", type=float, default=FOLLOW_IDLE_SECONDS,
+                        help="how long a followed log must stop growing before it is treated as finished")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    process_simulation_logs()
+    args = parse_args()
+    if args.migrate:
+        migrate(args.db)
+    elif args.export:
+        export_all(args.db, args.snapshot_dir)
+    elif args.archive:
+        archive_unarchived_logs(args.log_dir, args.archive_dir, args.chunk_rows)
+    elif args.reprocess:
+        reprocess_archives(args.db, args.archive_dir, args.chunk_rows, args.snapshot_dir, args.workers,
+                           args.manifest)
+    elif args.follow is not None:
+        log_path = args.follow or newest_log(args.log_dir)
+        if log_path is None:
+            raise SystemExit(f"No collision logs found in {args.log_dir}/ directory")
+        follow_log(log_path, args.db, args.manifest, args.idle_seconds, args.snapshot_dir, args.archive_dir)
+    elif args.rebuild:
+        rebuild_database(rebuild_sources(args.log_dir, args.archive_dir), args.db, args.workers,
+                         args.chunk_rows, args.archive_dir, args.snapshot_dir, args.manifest)
+    else:
+        process_simulation_logs(args.log_dir, args.db, args.manifest, args.chunk_rows, args.snapshot_dir,
+                                args.archive_dir)